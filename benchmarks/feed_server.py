@@ -0,0 +1,95 @@
+"""
+Local stand-in for the LinkedIn feed, serving recorded HTML snapshots.
+
+Usage: python -m benchmarks.feed_server [--port 8765] [--snapshot feed.html]
+"""
+
+import argparse
+import os
+import threading
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+DEFAULT_SNAPSHOT = "feed.html"
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "source", "track", "wbr"}
+
+HOME_PAGE = b"<!DOCTYPE html><html><head><title>LinkedIn</title></head><body></body></html>"
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    snapshot = DEFAULT_SNAPSHOT
+
+    def do_GET(self):
+        if self.path.startswith("/feed"):
+            with open(os.path.join(FIXTURES_DIR, self.snapshot), "rb") as f:
+                body = f.read()
+        else:
+            body = HOME_PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_feed_server(port=0, snapshot=DEFAULT_SNAPSHOT):
+    """Serve a snapshot at /feed/ from a daemon thread; returns (server, base_url)"""
+    handler = type("FeedHandler", (_FeedHandler,), {"snapshot": snapshot})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, name="feed-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _PostTextParser(HTMLParser):
+    """Collects the visible text of each feed-shared-update-v2 element"""
+
+    def __init__(self):
+        super().__init__()
+        self.posts = []
+        self._depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        if tag in VOID_TAGS:
+            return
+        if self._depth:
+            self._depth += 1
+        elif tag == "div" and "feed-shared-update-v2" in classes:
+            self._depth = 1
+            self.posts.append([])
+
+    def handle_endtag(self, tag):
+        if self._depth:
+            self._depth -= 1
+
+    def handle_data(self, data):
+        if self._depth and data.strip():
+            self.posts[-1].append(data.strip())
+
+
+def load_post_texts(snapshot=DEFAULT_SNAPSHOT, limit=300):
+    """Post texts from a snapshot, truncated like run_bot does"""
+    parser = _PostTextParser()
+    with open(os.path.join(FIXTURES_DIR, snapshot), "r", encoding="utf-8") as f:
+        parser.feed(f.read())
+    return ["\n".join(parts)[:limit] for parts in parser.posts]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT)
+    args = parser.parse_args()
+
+    server, url = start_feed_server(args.port, args.snapshot)
+    print(f"Serving {args.snapshot} at {url}/feed/ (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,55 @@
+"""
+Write the labelled posts in fixtures/labelled_posts.jsonl to a decision store,
+as "Connected" (should be selected) or "Skipped", so bot.sweep can calibrate
+thresholds against them.
+
+Usage:
+    python -m benchmarks.labelled_store /tmp/labelled.db
+    python -m bot.sweep --store /tmp/labelled.db --thresholds 0.05:0.5:0.01
+"""
+
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.feed_server import FIXTURES_DIR  # noqa: E402
+
+LABELLED_POSTS = os.path.join(FIXTURES_DIR, "labelled_posts.jsonl")
+
+
+def load_labelled_posts(path=LABELLED_POSTS):
+    """(text, should be selected) pairs"""
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row["text"], bool(row["select"])) for row in rows]
+
+
+def write_store(store_path, path=LABELLED_POSTS):
+    from bot.store import DecisionStore
+
+    store = DecisionStore(store_path)
+    try:
+        for text, select in load_labelled_posts(path):
+            store.record("Connected" if select else "Skipped", content=text)
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the labelled posts to a decision store")
+    parser.add_argument("store", help="path of the decision store to create")
+    args = parser.parse_args()
+    if os.path.exists(args.store):
+        print(f"❌ {args.store} already exists")
+        return 1
+    write_store(args.store)
+    print(f"✅ Wrote {len(load_labelled_posts())} labelled posts to {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
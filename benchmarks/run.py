@@ -0,0 +1,275 @@
+"""
+Offline benchmarks for the bot: scoring, decisions, log reading and sheet logging,
+plus an optional end-to-end run_bot against the local feed stand-in.
+
+Usage:
+    python -m benchmarks.run                         # micro-benchmarks
+    python -m benchmarks.run --e2e                   # also run_bot under headless Chrome
+    python -m benchmarks.run --save-baseline         # store results as the baseline
+    python -m benchmarks.run --tolerance 0.25        # fail if a median regresses >25%
+    python -m benchmarks.run --skip-startup          # skip the import-time budget
+
+Everything runs in a scratch directory, so config/, data/ and bot_logs.log
+in the repo are never touched.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.feed_server import load_post_texts, start_feed_server  # noqa: E402
+from benchmarks.startup import bench_startup  # noqa: E402
+
+RESULTS_PATH = os.path.join(REPO_ROOT, "benchmarks", "results.json")
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+# Each benchmark here must stay faster than the one it replaced, whatever the baseline
+FASTER_THAN = {
+    "score_posts_fitted_100": "score_posts_refit_100",
+    "score_posts_fitted_100_all_prompts": "score_posts_refit_100_all_prompts",
+}
+
+PROMPT = "I want to connect to people who are hiring for Software Engineer roles with experience of more than 1 year"
+
+
+def measure(fn, runs=20, warmup=2):
+    """Call fn repeatedly and summarise wall time in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "runs": runs,
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+    }
+
+
+def feed_posts(n=100):
+    texts = load_post_texts()
+    return [texts[i % len(texts)] for i in range(n)]
+
+
+def bench_scoring(results):
+    from bot.decision import DecisionEngine
+    from bot.probability_model import PostScorer
+    from bot.prompts import PROMPTS
+
+    posts = feed_posts(100)
+    refit = PostScorer(PROMPT)
+    fitted = PostScorer.load_or_fit(PROMPT)
+    results["score_posts_refit_100"] = measure(lambda: refit.score_posts(posts))
+    results["score_posts_fitted_100"] = measure(lambda: fitted.score_posts(posts))
+    results["score_posts_fitted_1"] = measure(lambda: fitted.score_posts(posts[:1]), runs=200)
+    refit_all = PostScorer(list(PROMPTS.values()))
+    fitted_all = PostScorer(list(PROMPTS.values())).fit()
+    results["score_posts_refit_100_all_prompts"] = measure(lambda: refit_all.score_posts(posts))
+    results["score_posts_fitted_100_all_prompts"] = measure(lambda: fitted_all.score_posts(posts))
+    results["scorer_load"] = measure(lambda: PostScorer.load())
+
+    engine = DecisionEngine(PROMPT)
+    results["get_relevant_posts_100"] = measure(lambda: engine.get_relevant_posts(posts))
+    results["score_batch_100"] = measure(lambda: engine.score_batch(posts))
+
+    bm25 = DecisionEngine(PROMPT, scorer="bm25")
+    results["score_batch_bm25_100"] = measure(lambda: bm25.score_batch(posts))
+
+
+def write_log(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            stamp = datetime.fromtimestamp(1.7e9 + i).strftime("%Y-%m-%d %H:%M:%S,123")
+            f.write(f"{stamp} - INFO - 📌 Processing post {i % 20}/20\n")
+
+
+def write_json_log(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            f.write(json.dumps({"ts": 1.7e9 + i, "level": "INFO", "event": "post_start",
+                                "session": "bench", "post": i % 20,
+                                "msg": f"📌 Processing post {i % 20}/20"}, ensure_ascii=False) + "\n")
+
+
+def bench_log_reading(results, lines=200_000):
+    import streamlit_app
+    from bot.logtail import tail_lines
+
+    write_log("bot_logs.log", lines)
+    results["tail_lines_1000"] = measure(lambda: tail_lines("bot_logs.log", 1000))
+    results["parse_log_lines_1000"] = measure(
+        lambda: streamlit_app.parse_log_lines(tail_lines("bot_logs.log", 1000))
+    )
+    results["read_log_file_warm_1000"] = measure(
+        lambda: streamlit_app.read_log_file("bot_logs.log", max_lines=1000)
+    )
+
+    write_json_log("bot_logs.jsonl", lines)
+    results["parse_json_log_lines_1000"] = measure(
+        lambda: streamlit_app.parse_json_log_lines(tail_lines("bot_logs.jsonl", 1000))
+    )
+
+
+class _StubWorksheet:
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.rows = 0
+
+    def append_rows(self, rows, value_input_option=None):
+        time.sleep(self.latency)
+        self.rows += len(rows)
+
+
+class _StubClient:
+    def __init__(self, worksheet):
+        self.sheet1 = worksheet
+
+    def open(self, name):
+        return self
+
+
+def bench_sheet_logging(results):
+    from bot import logger as bot_logger
+    from bot import sheets
+
+    worksheet = _StubWorksheet()
+    writer = sheets.SheetWriter(lambda: _StubClient(worksheet), batch_size=25, flush_interval=0.2)
+    writer.start()
+    sheets._writer = writer
+
+    results["record_decision"] = measure(
+        lambda: bot_logger.record_decision("A", "We're hiring engineers", "Skipped", score=0.1),
+        runs=200,
+    )
+    results["sheet_enqueue"] = measure(lambda: bot_logger.export_to_sheet("A", "c", "Skipped"), runs=200)
+
+    started = time.perf_counter()
+    writer.stop()
+    results["sheet_drain_ms"] = {"runs": 1, "median_ms": (time.perf_counter() - started) * 1000}
+    results["sheet_rows_sent"] = {"runs": 1, "value": worksheet.rows}
+
+
+def bench_e2e(results):
+    """run_bot end to end against the local feed stand-in (needs Chrome and chromedriver)"""
+    from bot import logger as bot_logger
+    from bot import metrics, scraper
+
+    server, url = start_feed_server()
+    scraper.LINKEDIN_URL = url
+    # The feed stand-in needs no login, so there is no cookie jar to check
+    scraper.AUTH_PREFLIGHT = False
+    bot_logger.SHEETS_EXPORT = False
+    try:
+        started = time.perf_counter()
+        scraper.run_bot()
+        results["run_bot_e2e"] = {"runs": 1, "median_ms": (time.perf_counter() - started) * 1000}
+    finally:
+        server.shutdown()
+
+    for name, labels, value in metrics.parse_prometheus(metrics.REGISTRY.render()):
+        if name == "bot_phase_seconds_sum":
+            results[f"phase_{labels['phase']}"] = {"runs": 1, "median_ms": value * 1000}
+
+
+def check_speedups(results):
+    """Benchmarks in FASTER_THAN that are not faster than what they replaced"""
+    slower = []
+    for name, replaced in FASTER_THAN.items():
+        if name in results and replaced in results:
+            if results[name]["median_ms"] >= results[replaced]["median_ms"]:
+                slower.append(f"{name} ({results[name]['median_ms']:.3f} ms) is not faster than "
+                              f"{replaced} ({results[replaced]['median_ms']:.3f} ms)")
+    return slower
+
+
+def compare(results, baseline, tolerance):
+    """Print each benchmark against the baseline; return the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':36} {'median ms':>12} {'baseline':>12} {'change':>8}")
+    for name, result in sorted(results.items()):
+        if "median_ms" not in result:
+            continue
+        base = baseline.get(name, {}).get("median_ms")
+        if not base:
+            print(f"{name:36} {result['median_ms']:12.3f} {'-':>12} {'new':>8}")
+            continue
+        change = result["median_ms"] / base - 1
+        flag = "  ⚠️" if change > tolerance else ""
+        print(f"{name:36} {result['median_ms']:12.3f} {base:12.3f} {change:+8.0%}{flag}")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline bot benchmarks")
+    parser.add_argument("--e2e", action="store_true", help="also run run_bot under headless Chrome")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--skip-startup", action="store_true", help="skip the import-time budget")
+    args = parser.parse_args()
+
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bot_bench_") as workdir:
+        os.chdir(workdir)
+        try:
+            # First, before this process has warmed the OS file cache any further
+            violations = [] if args.skip_startup else [f"Startup budget: {v}" for v in bench_startup(results)]
+            bench_scoring(results)
+            bench_log_reading(results)
+            bench_sheet_logging(results)
+            if args.e2e:
+                bench_e2e(results)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "e2e": args.e2e,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    violations += [f"Speedup lost: {v}" for v in check_speedups(results)]
+    for violation in violations:
+        print(f"❌ {violation}")
+    if regressions:
+        print(f"❌ Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+    return 1 if regressions or violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
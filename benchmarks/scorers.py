@@ -0,0 +1,185 @@
+"""
+Compare scoring backends (bot.decision.SCORERS) on recorded posts: build time,
+scoring latency, memory, agreement with the TF-IDF decisions, and accuracy
+against the labelled posts in fixtures/labelled_posts.jsonl.
+
+Usage:
+    python -m benchmarks.scorers                           # snapshot + labelled posts
+    python -m benchmarks.scorers --store data/decisions.db # plus recorded decisions
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.feed_server import load_post_texts  # noqa: E402
+from benchmarks.labelled_store import load_labelled_posts  # noqa: E402
+from benchmarks.run import measure  # noqa: E402
+
+REFERENCE = "tfidf"
+THRESHOLD_GRID = np.round(np.arange(0.01, 1.0, 0.01), 2)
+
+
+def recorded_posts(store_path=None, limit=5000):
+    posts = list(load_post_texts()) + [text for text, _ in load_labelled_posts()]
+    if store_path:
+        from bot.store import DecisionStore
+
+        store = DecisionStore(store_path)
+        try:
+            posts += [row["content"] for row in store.query(limit=limit) if row["content"]]
+        finally:
+            store.close()
+    return posts
+
+
+def build(name, prompts, workdir):
+    """Fit a backend from scratch in workdir; returns (engine, seconds, peak bytes)"""
+    from bot.decision import DecisionEngine
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        tracemalloc.start()
+        started = time.perf_counter()
+        engine = DecisionEngine(prompts, scorer=name)
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        os.chdir(cwd)
+    return engine, seconds, peak
+
+
+def score_peak_bytes(engine, posts):
+    tracemalloc.start()
+    engine.score_matrix(posts)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def rank_correlation(a, b):
+    """Spearman correlation (ties broken by position)"""
+    ra = np.argsort(np.argsort(a))
+    rb = np.argsort(np.argsort(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def label_accuracy(scores, labels, threshold):
+    """Share of labelled posts decided as labelled, and the counts of wrong selections and misses"""
+    selected = scores >= threshold
+    return {
+        "accuracy": float((selected == labels).mean()),
+        "false_positives": int((selected & ~labels).sum()),
+        "misses": int((~selected & labels).sum()),
+    }
+
+
+def compare_backends(posts, prompts, thresholds, labelled=()):
+    """thresholds: {backend name: threshold}, each backend judged at its own"""
+    from bot.decision import SCORERS
+
+    # Fitted models are written here; TF-IDF memory-maps them, so the directory
+    # has to outlive the scoring below
+    with tempfile.TemporaryDirectory(prefix="bot_scorers_") as workdir:
+        results = {}
+        engines = {}
+        for name in SCORERS:
+            engine, build_s, build_peak = build(name, prompts, workdir)
+            engines[name] = engine
+            results[name] = {
+                "build_ms": build_s * 1000,
+                "build_peak_kb": build_peak / 1024,
+                "score_100": measure(lambda: engine.score_batch(posts[:100])),
+                "score_1": measure(lambda: engine.score_batch(posts[:1]), runs=200),
+                "score_peak_kb": score_peak_bytes(engine, posts) / 1024,
+            }
+
+        reference = engines[REFERENCE].score_matrix(posts).max(axis=1)
+        reference_mask = reference >= thresholds[REFERENCE]
+        for name, engine in engines.items():
+            threshold = thresholds[name]
+            scores = engine.score_matrix(posts).max(axis=1)
+            mask = scores >= threshold
+            agreement_by_threshold = {
+                float(t): float(((scores >= t) == reference_mask).mean()) for t in THRESHOLD_GRID
+            }
+            # Ties go to the threshold nearest the one in use
+            best = max(agreement_by_threshold,
+                       key=lambda t: (agreement_by_threshold[t], -abs(t - threshold)))
+            results[name].update({
+                "threshold": threshold,
+                "selected": int(mask.sum()),
+                "agreement": float((mask == reference_mask).mean()),
+                "best_threshold": best,
+                "best_agreement": agreement_by_threshold[best],
+                "rank_correlation": rank_correlation(scores, reference),
+            })
+            if labelled:
+                texts = [text for text, _ in labelled]
+                labels = np.array([select for _, select in labelled])
+                labelled_scores = engine.score_matrix(texts).max(axis=1)
+                by_threshold = {float(t): label_accuracy(labelled_scores, labels, t) for t in THRESHOLD_GRID}
+                best = max(by_threshold, key=lambda t: (by_threshold[t]["accuracy"], -abs(t - threshold)))
+                results[name].update({
+                    "labelled": label_accuracy(labelled_scores, labels, threshold),
+                    "label_best_threshold": best,
+                    "label_best": by_threshold[best],
+                })
+    return results
+
+
+def main():
+    from bot.decision import SCORER_THRESHOLDS
+    from bot.prompts import PROMPTS
+
+    parser = argparse.ArgumentParser(description="Compare scoring backends")
+    parser.add_argument("--store", help="decision store whose recorded posts to include")
+    parser.add_argument("--threshold", type=float,
+                        help="one threshold for every backend (default: each backend's own)")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    posts = recorded_posts(args.store)
+    labelled = load_labelled_posts()
+    thresholds = {name: SCORER_THRESHOLDS[name] if args.threshold is None else args.threshold
+                  for name in SCORER_THRESHOLDS}
+    results = compare_backends(posts, list(PROMPTS.values()), thresholds, labelled)
+
+    print(f"{len(posts)} posts, reference {REFERENCE}")
+    print(f"{'backend':8} {'t':>5} {'build ms':>9} {'100 ms':>8} {'1 ms':>7} {'peak KB':>8} "
+          f"{'selected':>8} {'agree':>6} {'best t':>6} {'best':>6} {'rank r':>6}")
+    for name, r in results.items():
+        print(f"{name:8} {r['threshold']:5.2f} {r['build_ms']:9.1f} {r['score_100']['median_ms']:8.3f} "
+              f"{r['score_1']['median_ms']:7.3f} {r['score_peak_kb']:8.0f} {r['selected']:8} "
+              f"{r['agreement']:6.0%} {r['best_threshold']:6.2f} {r['best_agreement']:6.0%} "
+              f"{r['rank_correlation']:6.2f}")
+
+    positives = sum(select for _, select in labelled)
+    print(f"\nAgainst {len(labelled)} labelled posts ({positives} should be selected):")
+    print(f"{'backend':8} {'accuracy':>8} {'false +':>7} {'missed':>6} {'best t':>6} {'best':>6}")
+    for name, r in results.items():
+        at, best = r["labelled"], r["label_best"]
+        print(f"{name:8} {at['accuracy']:8.0%} {at['false_positives']:7} {at['misses']:6} "
+              f"{r['label_best_threshold']:6.2f} {best['accuracy']:6.0%}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Startup-time budget: how long importing each entry point takes in a fresh
+interpreter, measured with `python -X importtime`.
+
+Usage: python -m benchmarks.startup [--runs 5]
+
+Exits non-zero when an entry point goes over its budget or imports a package
+it must not load at startup (e.g. the dashboard pulling in scikit-learn).
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS = {
+    "bot_manager": 250,
+    "bot.scraper": 500,
+    "streamlit_app": 2000,
+}
+
+# Packages each entry point must leave to first use
+FORBIDDEN = {
+    "bot_manager": ("sklearn", "scipy", "selenium", "apscheduler"),
+    "bot.scraper": ("sklearn", "scipy"),
+    "streamlit_app": ("sklearn", "scipy", "selenium"),
+}
+
+
+def import_profile(module):
+    """One cold import of module: (cumulative ms, set of imported module names)"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    total_us = None
+    imported = set()
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue
+        imported.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return (total_us or 0) / 1000, imported
+
+
+def measure_startup(module, runs=5):
+    samples = []
+    imported = set()
+    for _ in range(runs):
+        ms, imported = import_profile(module)
+        samples.append(ms)
+    samples.sort()
+    return {
+        "runs": runs,
+        "median_ms": statistics.median(samples),
+        "min_ms": samples[0],
+        "budget_ms": BUDGETS_MS.get(module),
+        "forbidden": sorted(
+            pkg for pkg in FORBIDDEN.get(module, ()) if pkg in imported
+        ),
+    }
+
+
+def bench_startup(results, runs=5):
+    """Add import_<module> entries to results; return the budget violations"""
+    violations = []
+    for module, budget in BUDGETS_MS.items():
+        result = measure_startup(module, runs)
+        results[f"import_{module}"] = result
+        if result["median_ms"] > budget:
+            violations.append(f"{module} took {result['median_ms']:.0f} ms (budget {budget} ms)")
+        if result["forbidden"]:
+            violations.append(f"{module} imports {', '.join(result['forbidden'])} at startup")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    violations = bench_startup(results, args.runs)
+    print(f"{'module':20} {'median ms':>10} {'budget':>8}")
+    for name, result in results.items():
+        print(f"{name[len('import_'):]:20} {result['median_ms']:10.1f} {result['budget_ms']:8}")
+    for violation in violations:
+        print(f"❌ {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import pickle
+import time
+
+logger = logging.getLogger(__name__)
+
+COOKIES_PATH = "config/cookies.pkl"
+AUTH_STATE_PATH = "data/auth_state.json"
+# LinkedIn's session cookie; without it every page redirects to the login wall
+AUTH_COOKIES = ("li_at",)
+# Cookies this close to expiry would lapse mid-session
+MIN_TTL_SECONDS = float(os.environ.get("BOT_COOKIE_MIN_TTL_SECONDS", "300"))
+# After cookies are rejected by LinkedIn, skip sessions with the same cookie
+# file until it changes or this long has passed
+RETRY_AFTER_SECONDS = float(os.environ.get("BOT_AUTH_RETRY_SECONDS", str(6 * 3600)))
+
+# (path, mtime_ns, size) -> parsed cookie list
+_jar_cache = {}
+
+
+def cookie_file_version(path=COOKIES_PATH):
+    """(mtime_ns, size) of the cookie file; changes when it is replaced"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_cookies(path=COOKIES_PATH):
+    """The pickled Selenium cookie list, parsed once per version of the file"""
+    version = cookie_file_version(path)
+    cached = _jar_cache.get(path)
+    if cached is None or cached[0] != version:
+        with open(path, "rb") as f:
+            cached = (version, pickle.load(f))
+        _jar_cache[path] = cached
+    return cached[1]
+
+
+def check_cookies(cookies, now=None, min_ttl=MIN_TTL_SECONDS):
+    """(reason, message, expires_at) for a cookie jar; reason is "ok" when usable"""
+    now = time.time() if now is None else now
+    by_name = {c.get("name"): c for c in cookies if isinstance(c, dict)}
+    expires_at = None
+    for name in AUTH_COOKIES:
+        cookie = by_name.get(name)
+        if cookie is None:
+            return "no_auth_cookie", f"{name} cookie missing from the cookie jar", None
+        expiry = cookie.get("expiry")
+        if expiry is None:
+            continue
+        expires_at = expiry if expires_at is None else min(expires_at, expiry)
+        if expiry - now < min_ttl:
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(expiry))
+            return "expired", f"{name} cookie expired or expiring ({when})", expiry
+    return "ok", "auth cookies present and unexpired", expires_at
+
+
+def last_auth_result(path=AUTH_STATE_PATH):
+    """The most recent pre-flight or login result, or None if none was recorded"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def record_auth_result(reason, message, cookies_path=COOKIES_PATH, path=AUTH_STATE_PATH, **fields):
+    """Keep the latest auth result (and the cookie file it applied to) for later
+    sessions and the dashboard"""
+    try:
+        version = list(cookie_file_version(cookies_path))
+    except OSError:
+        version = None
+    result = {
+        "ok": reason == "ok",
+        "reason": reason,
+        "message": message,
+        "checked_at": time.time(),
+        "cookie_version": version,
+        **fields,
+    }
+    try:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not record auth result: {e}")
+    return result
+
+
+def preflight(cookies_path=COOKIES_PATH, state_path=AUTH_STATE_PATH, now=None):
+    """Decide, without a browser, whether a session can log in.
+
+    Fails when the cookie file is missing or unreadable, the auth cookie is
+    absent or about to expire, or LinkedIn already rejected this exact
+    cookie file within RETRY_AFTER_SECONDS. Failures are recorded; a pass
+    leaves the last recorded result alone until the feed confirms it.
+    """
+    now = time.time() if now is None else now
+    try:
+        cookies = load_cookies(cookies_path)
+    except FileNotFoundError:
+        return record_auth_result("missing_cookies", f"{cookies_path} not found",
+                                  cookies_path, state_path)
+    except Exception as e:
+        return record_auth_result("unreadable_cookies", f"could not read {cookies_path}: {e}",
+                                  cookies_path, state_path)
+
+    reason, message, expires_at = check_cookies(cookies, now)
+    if reason != "ok":
+        return record_auth_result(reason, message, cookies_path, state_path, expires_at=expires_at)
+
+    last = last_auth_result(state_path)
+    if (last and last.get("reason") == "rejected"
+            and last.get("cookie_version") == list(cookie_file_version(cookies_path))
+            and now - last.get("checked_at", 0) < RETRY_AFTER_SECONDS):
+        return {**last, "message": f"{last['message']} (same cookie file; replace it to retry)"}
+    return {"ok": True, "reason": "ok", "message": message, "expires_at": expires_at}
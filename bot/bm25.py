@@ -0,0 +1,163 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from bot.probability_model import CORPUS_PATH, load_corpus
+from bot.store import DECISIONS_DB_PATH, DecisionStore
+
+BM25_PATH = "config/bm25.json"
+K1 = 1.2
+B = 0.75
+
+# Same tokens as the TF-IDF scorer (sklearn's default pattern and stop words)
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOP_WORDS]
+
+
+class BM25Scorer:
+    """Okapi BM25 with the prompts as queries and posts as documents.
+
+    Only prompt terms are indexed: an inverted index maps each term to the
+    prompts containing it, so a post is scored in one pass over its tokens.
+    Corpus statistics (document count, average length and document
+    frequency of the prompt terms) are updated incrementally from the
+    reference corpus and the decision store. Scores are divided by what a
+    post of average length containing each prompt term once would get, so
+    they fall in 0-1, but on-topic posts score lower than their TF-IDF
+    cosine: BM25 has its own threshold (bot.decision.SCORER_THRESHOLDS).
+    """
+
+    def __init__(self, prompts, k1=K1, b=B):
+        self.prompts = [prompts] if isinstance(prompts, str) else list(prompts)
+        self.prompt = self.prompts[0]
+        self.k1 = k1
+        self.b = b
+        # term -> [(prompt index, term count in prompt)]
+        self.index = {}
+        for i, prompt in enumerate(self.prompts):
+            for term, count in Counter(tokenize(prompt)).items():
+                self.index.setdefault(term, []).append((i, count))
+        self.n_docs = 0
+        self.total_len = 0
+        self.df = dict.fromkeys(self.index, 0)
+        # Newest decision already folded into the statistics
+        self.last_id = 0
+        self._refresh_weights()
+
+    @property
+    def is_fitted(self):
+        return self.n_docs > 0
+
+    def _refresh_weights(self):
+        n = self.n_docs
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in self.df.items()
+        }
+        self.avgdl = self.total_len / n if n else 1.0
+        self.norms = np.zeros(len(self.prompts))
+        for term, postings in self.index.items():
+            for i, count in postings:
+                self.norms[i] += self.idf[term] * count
+        self.norms[self.norms == 0] = 1.0
+
+    def update(self, documents):
+        """Fold more documents into the corpus statistics"""
+        for text in documents:
+            tokens = tokenize(text)
+            self.n_docs += 1
+            self.total_len += len(tokens)
+            for term in self.index.keys() & set(tokens):
+                self.df[term] += 1
+        self._refresh_weights()
+        return self
+
+    def fit(self, corpus=()):
+        return self.update(list(corpus))
+
+    def refresh(self, store_path=DECISIONS_DB_PATH):
+        """Add decisions recorded since the last refresh; returns how many"""
+        if not os.path.exists(store_path):
+            return 0
+        store = DecisionStore(store_path)
+        try:
+            rows = store.contents_after(self.last_id)
+        finally:
+            store.close()
+        if rows:
+            self.update(content or "" for _, content in rows)
+            self.last_id = rows[-1][0]
+        return len(rows)
+
+    def save(self, path=BM25_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        state = {
+            "prompts": self.prompts,
+            "k1": self.k1,
+            "b": self.b,
+            "n_docs": self.n_docs,
+            "total_len": self.total_len,
+            "df": self.df,
+            "last_id": self.last_id,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=BM25_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        scorer = cls(state["prompts"], k1=state["k1"], b=state["b"])
+        scorer.n_docs = state["n_docs"]
+        scorer.total_len = state["total_len"]
+        scorer.df.update({t: n for t, n in state["df"].items() if t in scorer.df})
+        scorer.last_id = state["last_id"]
+        scorer._refresh_weights()
+        return scorer
+
+    @classmethod
+    def load_or_fit(cls, prompts, path=BM25_PATH, corpus_path=CORPUS_PATH,
+                    store_path=DECISIONS_DB_PATH):
+        """Reuse saved statistics for these prompts, then catch up on new decisions"""
+        wanted = cls(prompts).prompts
+        try:
+            scorer = cls.load(path)
+            if scorer.prompts != wanted:
+                raise ValueError("prompts changed")
+        except (OSError, ValueError, KeyError):
+            scorer = cls(wanted).fit(load_corpus(corpus_path))
+            scorer.refresh(store_path)
+            scorer.save(path)
+            return scorer
+        if scorer.refresh(store_path):
+            scorer.save(path)
+        return scorer
+
+    def score_matrix(self, posts):
+        """Normalised BM25 scores of shape (len(posts), len(prompts))"""
+        scores = np.zeros((len(posts), len(self.prompts)))
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        for row, text in enumerate(posts):
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            counts = Counter(t for t in tokens if t in self.index)
+            length_norm = k1 * (1 - b + b * len(tokens) / avgdl)
+            for term, tf in counts.items():
+                weight = self.idf[term] * tf * (k1 + 1) / (tf + length_norm)
+                for i, count in self.index[term]:
+                    scores[row, i] += weight * count
+        np.minimum(scores / self.norms, 1.0, out=scores)
+        return scores
+
+    def score_posts(self, posts):
+        """Best score per post across all prompts"""
+        return self.score_matrix(posts).max(axis=1)
@@ -0,0 +1,228 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from bot import metrics
+from bot.procutil import kill_pids, pid_alive, process_tree, tree_rss_bytes
+from bot.waits import PAGE_LOAD_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ROOT = tempfile.gettempdir()
+PROFILE_PREFIX = "profile_"
+# Short backoff between Chrome start attempts; failures are usually immediate
+INIT_RETRY_DELAYS = (0.5, 1.0)
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+def build_options(profile_dir):
+    chrome_options = Options()
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-software-rasterizer")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+    chrome_options.add_argument("--js-flags=--max-old-space-size=512")
+
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+
+    # Anti-detection and unique profile
+    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+
+    # Headless mode for EC2
+    chrome_options.add_argument("--headless=new")
+    return chrome_options
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _profile_in_use(path):
+    """Chrome keeps a SingletonLock symlink to '<host>-<pid>' while a profile is open"""
+    try:
+        target = os.readlink(os.path.join(path, "SingletonLock"))
+        return pid_alive(int(target.rsplit("-", 1)[1]))
+    except (OSError, ValueError, IndexError):
+        return False
+
+
+class DriverManager:
+    """Owns one Chrome session that is kept warm between bot runs.
+
+    The driver is health-checked before reuse and recycled after max_runs
+    runs, after a failed run, or once its process tree exceeds max_rss_mb.
+    Only processes started by this manager are ever killed.
+    """
+
+    def __init__(self, max_runs=10, max_rss_mb=1200, profile_quota_mb=500,
+                 stale_profile_hours=6, profile_root=PROFILE_ROOT):
+        self.max_runs = max_runs
+        self.max_rss_mb = max_rss_mb
+        self.profile_quota_mb = profile_quota_mb
+        self.stale_profile_hours = stale_profile_hours
+        self.profile_root = profile_root
+
+        self.driver = None
+        self.profile_dir = None
+        self.runs = 0
+        self.fresh = False
+        self._lock = threading.Lock()
+
+    @property
+    def service_pid(self):
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def owned_pids(self):
+        return process_tree(self.service_pid)
+
+    def rss_mb(self):
+        return tree_rss_bytes(self.service_pid) / (1024 * 1024)
+
+    def healthy(self):
+        if self.driver is None:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _start(self):
+        self.gc_profiles()
+        self.profile_dir = os.path.join(self.profile_root, f"{PROFILE_PREFIX}{uuid.uuid4()}")
+        chrome_options = build_options(self.profile_dir)
+        service = Service()
+        for attempt in range(3):
+            try:
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                self.driver.execute_script(
+                    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+                )
+                # Fail fast on a hung navigation instead of blocking the session
+                self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+                logger.info("✅ Chrome driver initialized")
+                break
+            except Exception as e:
+                metrics.CHROME_RETRIES.inc()
+                logger.warning(f"Retry {attempt+1}/3 - Chrome init failed: {e}")
+                if attempt < len(INIT_RETRY_DELAYS):
+                    time.sleep(INIT_RETRY_DELAYS[attempt])
+
+        if not self.driver:
+            self._remove_profile()
+            raise Exception("Failed to initialize Chrome after 3 attempts")
+        self.runs = 0
+        self.fresh = True
+
+    def acquire(self):
+        """Return a live driver, reusing the warm one when it is healthy"""
+        with self._lock:
+            if self.driver is not None and not self.healthy():
+                logger.warning("🩺 Chrome session is unresponsive, restarting")
+                self._close()
+            if self.driver is None:
+                self._start()
+            else:
+                self.fresh = False
+                logger.info(f"♻️ Reusing warm Chrome session (run {self.runs + 1}/{self.max_runs})")
+            return self.driver
+
+    def release(self, failed=False):
+        """Finish a run; recycle the driver if it failed, is old, or is too big"""
+        with self._lock:
+            if self.driver is None:
+                return
+            self.runs += 1
+            rss = self.rss_mb()
+            reason = None
+            if failed:
+                reason = "run failed"
+            elif self.runs >= self.max_runs:
+                reason = f"{self.runs} runs"
+            elif rss > self.max_rss_mb:
+                reason = f"RSS {rss:.0f} MB > {self.max_rss_mb} MB"
+            if reason:
+                logger.info(f"♻️ Recycling Chrome session ({reason})")
+                self._close()
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self.driver is None:
+            return
+        pids = self.owned_pids()
+        try:
+            self.driver.quit()
+            logger.info("🛑 Chrome closed cleanly")
+        except Exception as e:
+            logger.warning(f"⚠️ driver.quit failed: {e}")
+        leftover = kill_pids([pid for pid in pids if pid_alive(pid)])
+        if leftover:
+            logger.warning(f"🛑 Force-killed {len(leftover)} leftover Chrome processes")
+        self.driver = None
+        self._remove_profile()
+
+    def _remove_profile(self):
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def gc_profiles(self):
+        """Delete stale profile directories and keep the rest under the disk quota"""
+        try:
+            names = [n for n in os.listdir(self.profile_root) if n.startswith(PROFILE_PREFIX)]
+        except OSError:
+            return 0
+        candidates = []
+        for name in names:
+            path = os.path.join(self.profile_root, name)
+            if path == self.profile_dir or not os.path.isdir(path) or _profile_in_use(path):
+                continue
+            try:
+                candidates.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+
+        removed = 0
+        stale_before = time.time() - self.stale_profile_hours * 3600
+        quota = self.profile_quota_mb * 1024 * 1024
+        kept = []
+        for mtime, path in sorted(candidates):
+            if mtime < stale_before:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+            else:
+                kept.append((path, _dir_size(path)))
+        used = sum(size for _, size in kept)
+        for path, size in kept:
+            if used <= quota:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            used -= size
+            removed += 1
+        if removed:
+            logger.info(f"🧹 Removed {removed} old Chrome profile directories")
+        return removed
@@ -10,16 +10,16 @@
 # results = engine.get_relevant_posts(posts)
 
 
-from selenium.webdriver.common.by import By
+from bot.extract import click_post_button
+from bot.tracing import traced
 
 
-def try_connect(post_element):
+@traced()
+def connect_post(driver, post):
+    # post is a record from bot.extract.extract_posts
+    if post["connect"] < 0:
+        return False
     try:
-        buttons = post_element.find_elements(By.TAG_NAME, "button")
-        for btn in buttons:
-            if "Connect" in btn.text:
-                btn.click()
-                return True
+        return click_post_button(driver, post["id"], post["connect"])
     except:
-        pass
-    return False
+        return False
@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from bot.procutil import pid_alive
+
+CONTROL_DB_PATH = "data/control.db"
+# A worker that has not written a heartbeat for this long is considered gone
+HEARTBEAT_TIMEOUT = 10
+
+STATUS_FIELDS = [
+    "pid",
+    "heartbeat",
+    "state",
+    "scheduled",
+    "interval_minutes",
+    "next_run",
+    "last_run",
+    "run_count",
+    "error_count",
+    "last_error",
+    "session",
+    "phase",
+    "post",
+    "post_total",
+]
+
+
+class ControlChannel:
+    """Command queue and status row shared by the dashboard and the bot worker.
+
+    The dashboard appends commands and reads the single status row; the
+    worker claims commands and keeps the status row current. Both sides only
+    touch SQLite (WAL mode), never the browser.
+    """
+
+    def __init__(self, path=CONTROL_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS commands ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " ts REAL NOT NULL,"
+            " command TEXT NOT NULL,"
+            " args TEXT,"
+            " state TEXT NOT NULL DEFAULT 'pending',"
+            " result TEXT,"
+            " done_ts REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS commands_state ON commands (state, id)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS status ("
+            " id INTEGER PRIMARY KEY CHECK (id = 1),"
+            " pid INTEGER,"
+            " heartbeat REAL,"
+            " state TEXT,"
+            " scheduled INTEGER DEFAULT 0,"
+            " interval_minutes REAL,"
+            " next_run REAL,"
+            " last_run REAL,"
+            " run_count INTEGER DEFAULT 0,"
+            " error_count INTEGER DEFAULT 0,"
+            " last_error TEXT,"
+            " session TEXT,"
+            " phase TEXT,"
+            " post INTEGER,"
+            " post_total INTEGER)"
+        )
+        self.conn.execute("INSERT OR IGNORE INTO status (id, state) VALUES (1, 'stopped')")
+        self.conn.commit()
+
+    def send(self, command, **args):
+        """Queue a command for the worker; returns its id"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO commands (ts, command, args) VALUES (?, ?, ?)",
+                (time.time(), command, json.dumps(args)),
+            )
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def claim(self):
+        """Take every pending command as (id, command, args), oldest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, command, args FROM commands WHERE state = 'pending' ORDER BY id"
+            ).fetchall()
+            if rows:
+                self.conn.execute(
+                    f"UPDATE commands SET state = 'running'"
+                    f" WHERE id IN ({', '.join('?' * len(rows))})",
+                    [row[0] for row in rows],
+                )
+                self.conn.commit()
+        return [(cmd_id, command, json.loads(args or "{}")) for cmd_id, command, args in rows]
+
+    def finish(self, cmd_id, ok=True, result=None):
+        with self._lock:
+            self.conn.execute(
+                "UPDATE commands SET state = ?, result = ?, done_ts = ? WHERE id = ?",
+                ("done" if ok else "failed", result, time.time(), cmd_id),
+            )
+            self.conn.commit()
+
+    def command_state(self, cmd_id):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT state, result FROM commands WHERE id = ?", (cmd_id,)
+            ).fetchone()
+        return row
+
+    def update_status(self, **fields):
+        unknown = set(fields) - set(STATUS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown status fields: {', '.join(sorted(unknown))}")
+        if not fields:
+            return
+        with self._lock:
+            self.conn.execute(
+                f"UPDATE status SET {', '.join(f'{key} = ?' for key in fields)} WHERE id = 1",
+                list(fields.values()),
+            )
+            self.conn.commit()
+
+    def status(self):
+        """The worker's status row as a dict; a single primary-key lookup"""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(STATUS_FIELDS)} FROM status WHERE id = 1"
+            ).fetchone()
+        return dict(zip(STATUS_FIELDS, row))
+
+    def worker_alive(self, status=None):
+        status = status or self.status()
+        if not status["pid"] or not status["heartbeat"]:
+            return False
+        if time.time() - status["heartbeat"] > HEARTBEAT_TIMEOUT:
+            return False
+        return pid_alive(status["pid"])
+
+    def close(self):
+        self.conn.close()
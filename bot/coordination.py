@@ -0,0 +1,172 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+LOCK_PATH = "data/run.lock"
+JOBSTORE_DIR = "data"
+MIN_GAP_SECONDS = 30
+# None: a run missed while the process was down still happens (once) on restart
+MISFIRE_GRACE_SECONDS = None
+
+
+class RunLock:
+    """Inter-process lock (flock) so only one bot session runs on the host"""
+
+    def __init__(self, path=LOCK_PATH):
+        self.path = path
+        self._fd = None
+
+    def acquire(self):
+        """Take the lock without blocking; False if another process holds it"""
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def lock_holder(path=LOCK_PATH):
+    """PID of the process currently running a session, or None"""
+    lock = RunLock(path)
+    if lock.acquire():
+        lock.release()
+        return None
+    try:
+        with open(path, "r") as f:
+            return int(f.read().strip() or 0) or None
+    except (OSError, ValueError):
+        return None
+
+
+def build_scheduler(scheduler_cls, name):
+    """APScheduler with a SQLite job store (data/jobs_<name>.sqlite) so restarts keep
+    the schedule; missed runs are coalesced into one and never overlap"""
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+
+    os.makedirs(JOBSTORE_DIR, exist_ok=True)
+    url = f"sqlite:///{os.path.join(JOBSTORE_DIR, f'jobs_{name}.sqlite')}"
+    return scheduler_cls(
+        jobstores={"default": SQLAlchemyJobStore(url=url)},
+        job_defaults={
+            "coalesce": True,
+            "max_instances": 1,
+            "misfire_grace_time": MISFIRE_GRACE_SECONDS,
+        },
+    )
+
+
+def persisted_next_run(scheduler_cls, name, job_id="linkedin_bot"):
+    """Next run time of a job an earlier process left in the job store, or None"""
+    scheduler = build_scheduler(scheduler_cls, name)
+    # Paused: open the job stores without running (or misfiring) anything
+    scheduler.start(paused=True)
+    try:
+        job = scheduler.get_job(job_id)
+        return job.next_run_time if job else None
+    finally:
+        scheduler.shutdown(wait=False)
+
+
+# Coordinators by job id; persisted jobs reference run_scheduled_job by name
+# and look their coordinator up here
+_coordinators = {}
+
+
+def run_scheduled_job(job_id):
+    coordinator = _coordinators.get(job_id)
+    if coordinator is None:
+        logger.warning(f"No coordinator registered for job {job_id}, skipping")
+        return
+    coordinator.run()
+
+
+class RunCoordinator:
+    """Schedules job_fn so each run starts interval after the previous one started,
+    or min_gap after it finished if the run took longer than the interval"""
+
+    def __init__(self, scheduler, job_fn, interval_minutes, job_id="linkedin_bot",
+                 min_gap_seconds=MIN_GAP_SECONDS):
+        self.scheduler = scheduler
+        self.job_fn = job_fn
+        self.interval = timedelta(minutes=interval_minutes)
+        self.min_gap = timedelta(seconds=min_gap_seconds)
+        self.job_id = job_id
+        self.last_duration = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the scheduler; blocks for a BlockingScheduler"""
+        from apscheduler.events import EVENT_SCHEDULER_START
+
+        _coordinators[self.job_id] = self
+        self.scheduler.add_listener(self._on_start, EVENT_SCHEDULER_START)
+        self.scheduler.start()
+
+    def _on_start(self, event):
+        # Job stores are open by now, so a schedule persisted by an earlier
+        # process can be found and kept
+        job = self.scheduler.get_job(self.job_id)
+        if job is not None and job.next_run_time is not None:
+            logger.info(f"⏰ Resuming persisted schedule, next run at {job.next_run_time}")
+        else:
+            self._schedule(datetime.now() + self.interval)
+
+    def _schedule(self, run_date):
+        self.scheduler.add_job(
+            "bot.coordination:run_scheduled_job",
+            "date",
+            run_date=run_date,
+            id=self.job_id,
+            kwargs={"job_id": self.job_id},
+            replace_existing=True,
+        )
+        logger.info(f"⏰ Next run scheduled for {run_date:%Y-%m-%d %H:%M:%S}")
+
+    def run(self):
+        with self._lock:
+            started_at = datetime.now()
+            started = time.perf_counter()
+            try:
+                self.job_fn()
+            finally:
+                self.last_duration = time.perf_counter() - started
+                finished_at = started_at + timedelta(seconds=self.last_duration)
+                next_run = max(started_at + self.interval, finished_at + self.min_gap)
+                logger.info(f"⏱️ Run took {self.last_duration:.0f}s")
+                if self.scheduler.running:
+                    self._schedule(next_run)
+
+    def next_run_time(self):
+        job = self.scheduler.get_job(self.job_id) if self.scheduler.running else None
+        return job.next_run_time if job else None
+
+    def stop(self, clear_schedule=True):
+        if clear_schedule and self.scheduler.get_job(self.job_id):
+            self.scheduler.remove_job(self.job_id)
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        _coordinators.pop(self.job_id, None)
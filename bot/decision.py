@@ -1,20 +1,113 @@
+from collections import namedtuple
+import numpy as np
+from bot.bm25 import BM25Scorer
 from bot.probability_model import PostScorer
-THRESHOLD = 0.75
+from bot.tracing import traced
+# Default threshold per backend, calibrated on benchmarks/fixtures/labelled_posts.jsonl
+# with bot.sweep (see benchmarks/README.md). TF-IDF cosines of on-topic posts sit
+# around 0.15-0.4; normalised BM25 scores run lower, so it needs its own value
+SCORER_THRESHOLDS = {
+    "tfidf": 0.15,
+    "bm25": 0.05,
+}
+THRESHOLD = SCORER_THRESHOLDS["tfidf"]
+
+# Scoring backends by name. Each takes the prompt texts and provides
+# load_or_fit(prompts), score_matrix(posts) -> (n_posts, n_prompts) scores,
+# score_posts(posts) and refresh() (catch up on new decisions; returns a count)
+SCORERS = {
+    "tfidf": PostScorer,
+    "bm25": BM25Scorer,
+}
+
+# Columnar result of scoring a whole feed: every array is indexed by post.
+# prompt holds the index of the best-matching prompt (see DecisionEngine.prompt_ids)
+BatchDecision = namedtuple("BatchDecision", ["scores", "mask", "prompt"])
 
 
 class DecisionEngine:
-    def __init__(self, prompt):
-        self.model = PostScorer(prompt)
+    def __init__(self, prompts, thresholds=None, fit_once=True, scorer="tfidf"):
+        # prompts: a single prompt string, a list of prompts, or {prompt_id: prompt}
+        # thresholds: one value for all prompts, {prompt_id: threshold}, or either
+        # of those keyed by scorer name ({"tfidf": {...}, "bm25": {...}})
+        if isinstance(prompts, str):
+            prompts = {"default": prompts}
+        elif not isinstance(prompts, dict):
+            prompts = {str(i): p for i, p in enumerate(prompts)}
+        self.prompt_ids = list(prompts)
+
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer {scorer!r}, expected one of {', '.join(SCORERS)}")
+        default = SCORER_THRESHOLDS[scorer]
+        if isinstance(thresholds, dict) and set(thresholds) & set(SCORERS):
+            thresholds = thresholds.get(scorer)
+        if thresholds is None:
+            thresholds = default
+        if isinstance(thresholds, dict):
+            self.thresholds = np.array(
+                [thresholds.get(pid, default) for pid in self.prompt_ids]
+            )
+        else:
+            self.thresholds = np.full(len(self.prompt_ids), float(thresholds))
+
+        # fit_once loads (or builds and saves) the fitted scorer so posts are
+        # only transformed; fit_once=False refits on every call
+        self.scorer = scorer
+        self.fit_once = fit_once
+        scorer_cls = SCORERS[scorer]
+        texts = list(prompts.values())
+        self.model = scorer_cls.load_or_fit(texts) if fit_once else scorer_cls(texts)
+
+    @traced("scorer_refresh", cat="scoring")
+    def refresh(self):
+        """Let the scorer catch up on decisions recorded since it was built"""
+        added = self.model.refresh()
+        if added and self.fit_once:
+            self.model.save()
+        return added
+
+    def score_matrix(self, post_texts):
+        """Scores of shape (len(post_texts), len(prompt_ids))"""
+        if not post_texts:
+            return np.empty((0, len(self.prompt_ids)))
+        return np.asarray(self.model.score_matrix(list(post_texts)), dtype=np.float64)
+
+    @traced(cat="scoring")
+    def score_batch(self, post_texts, threshold=None):
+        """Score all posts against all prompts in one sparse-matrix call"""
+        matrix = self.score_matrix(post_texts)
+        thresholds = self.thresholds if threshold is None else threshold
+        passed = matrix >= thresholds
+        mask = passed.any(axis=1)
+
+        # Best prompt among those that passed, otherwise the highest score overall
+        ranked = np.where(passed, matrix, -np.inf)
+        best = np.where(mask, ranked.argmax(axis=1), matrix.argmax(axis=1))
+        scores = matrix[np.arange(len(matrix)), best]
+        return BatchDecision(scores, mask, best)
+
+    def top_k(self, post_texts, k=3):
+        """Per post, the k best prompt indices and their scores, best first"""
+        matrix = self.score_matrix(post_texts)
+        k = min(k, matrix.shape[1])
+        if k < matrix.shape[1]:
+            idx = np.argpartition(-matrix, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.tile(np.arange(k), (len(matrix), 1))
+        top = np.take_along_axis(matrix, idx, axis=1)
+        order = np.argsort(-top, axis=1, kind="stable")
+        return np.take_along_axis(idx, order, axis=1), np.take_along_axis(top, order, axis=1)
 
-    def get_relevant_posts(self, post_texts, threshold=0.75):
-        scores = self.model.score_posts(post_texts)
+    def get_relevant_posts(self, post_texts, threshold=None):
+        batch = self.score_batch(post_texts, threshold)
         result = []
-        for i, score in enumerate(scores):
+        for i, score in enumerate(batch.scores):
             result.append(
                 {
                     "text": post_texts[i],
-                    "score": round(score, 3),
-                    "should_connect": score >= threshold,
+                    "score": round(float(score), 3),
+                    "prompt_id": self.prompt_ids[batch.prompt[i]],
+                    "should_connect": bool(batch.mask[i]),
                 }
             )
-        return result
\ No newline at end of file
+        return result
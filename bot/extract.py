@@ -0,0 +1,57 @@
+import json
+
+POST_ID_ATTR = "data-bot-id"
+
+# Runs in the page: one round trip returns every post as a compact record and
+# tags each element with data-bot-id so later actions can find it again
+EXTRACT_POSTS_JS = """
+const limit = arguments[0];
+const posts = document.getElementsByClassName('feed-shared-update-v2');
+const out = [];
+for (let i = 0; i < posts.length; i++) {
+  const el = posts[i];
+  const urn = el.getAttribute('data-urn');
+  const id = el.getAttribute('data-bot-id') || urn || ('post-' + Date.now() + '-' + i);
+  el.setAttribute('data-bot-id', id);
+  const nameEl = el.querySelector('span.feed-shared-actor__name');
+  const buttons = el.getElementsByTagName('button');
+  let connect = -1;
+  for (let j = 0; j < buttons.length; j++) {
+    if ((buttons[j].innerText || '').includes('Connect')) { connect = j; break; }
+  }
+  out.push({
+    id: id,
+    urn: urn,
+    text: (el.innerText || '').slice(0, limit),
+    name: nameEl ? nameEl.innerText.trim() : null,
+    connect: connect
+  });
+}
+return out;
+"""
+
+CLICK_BUTTON_JS = """
+const post = document.querySelector(arguments[0]);
+if (!post) { return false; }
+const button = post.getElementsByTagName('button')[arguments[1]];
+if (!button || !(button.innerText || '').includes('Connect')) { return false; }
+button.click();
+return true;
+"""
+
+
+def post_selector(post_id):
+    return f"[{POST_ID_ATTR}={json.dumps(post_id)}]"
+
+
+def extract_posts(driver, limit=300):
+    """All feed posts as [{id, urn, text, name, connect}] from a single execute_script.
+
+    connect is the index of the post's Connect button, or -1 if it has none.
+    """
+    return driver.execute_script(EXTRACT_POSTS_JS, limit) or []
+
+
+def click_post_button(driver, post_id, button_index):
+    """Click a post's button by index, re-checking its label; one round trip"""
+    return bool(driver.execute_script(CLICK_BUTTON_JS, post_selector(post_id), button_index))
@@ -1,8 +1,10 @@
 import random
 import time
 from selenium.webdriver.common.action_chains import ActionChains
+from bot.tracing import span, traced
 
 
+@traced()
 def random_click(driver):
     # Click on random spot on screen to mimic human
     width = driver.execute_script("return window.innerWidth")
@@ -12,10 +14,15 @@ def random_click(driver):
     y = random.randint(0, height - 1)
 
     driver.execute_script(f"document.elementFromPoint({x}, {y}).click()")
-    time.sleep(random.uniform(0.5, 2))
+    pause = random.uniform(0.5, 2)
+    with span("sleep", seconds=pause):
+        time.sleep(pause)
 
 
+@traced()
 def random_scroll(driver):
     scroll_by = random.randint(200, 700)
     driver.execute_script(f"window.scrollBy(0, {scroll_by});")
-    time.sleep(random.uniform(1, 3))
+    pause = random.uniform(1, 3)
+    with span("sleep", seconds=pause):
+        time.sleep(pause)
@@ -0,0 +1,81 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import uuid
+from logging.handlers import RotatingFileHandler
+from bot.rollups import LogRollupHandler
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_session_id = None
+
+
+def new_session():
+    """Start a new bot session id, attached to every structured record"""
+    global _session_id
+    _session_id = uuid.uuid4().hex[:12]
+    return _session_id
+
+
+def current_session():
+    return _session_id
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts (epoch), level, event, session, post, msg,
+    plus any scalar fields passed with extra={...}"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "event": getattr(record, "event", None),
+            "session": _session_id,
+            "post": getattr(record, "post", None),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRS or key in entry:
+                continue
+            if isinstance(value, (int, float, str, bool)) or value is None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def gzip_rotator(source, dest):
+    """Compress the rolled-over log into its .gz archive"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def setup_logging(log_format=None):
+    """Log to the console and a rotating bot log file; returns the file path.
+
+    BOT_LOG_FORMAT=json writes JSON lines to bot_logs.jsonl instead of
+    bot_logs.log. The file rotates at 10 MB, keeping 5 gzip archives
+    (bot_logs.log.1.gz ... .5.gz). Record counts per level also go to the
+    log rollup (bot.rollups) that the dashboard reads.
+    """
+    log_format = log_format or os.environ.get("BOT_LOG_FORMAT", "text")
+    log_file = "bot_logs.jsonl" if log_format == "json" else "bot_logs.log"
+    file_handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5)
+    file_handler.namer = lambda name: name + ".gz"
+    file_handler.rotator = gzip_rotator
+    if log_format == "json":
+        file_handler.setFormatter(JsonFormatter())
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[file_handler, logging.StreamHandler(), LogRollupHandler()],
+    )
+    return log_file
@@ -1,39 +1,48 @@
-import gspread
 import logging
-from oauth2client.service_account import ServiceAccountCredentials
+import os
 from datetime import datetime
-from selenium.webdriver.common.by import By
+from bot.sheets import get_sheet_writer
+from bot.store import DecisionStore
+from bot.tracing import traced
 
 logger = logging.getLogger(__name__)
 
-def log_to_sheet(post, content, decision):
+# Google Sheets is an optional export; the local decision store is the record
+SHEETS_EXPORT = os.environ.get("BOT_SHEETS_EXPORT", "1") != "0"
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = DecisionStore()
+    return _store
+
+
+@traced()
+def record_decision(name, content, decision, post_id=None, score=None, prompt=None,
+                    latency_ms=None):
+    """Write a decision to the local store, then export it to the sheet if enabled"""
     try:
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(
-            "config/credentials.json", scope
+        get_store().record(
+            decision,
+            content=content,
+            name=name,
+            post_id=post_id,
+            score=score,
+            prompt=prompt,
+            latency_ms=latency_ms,
         )
-        client = gspread.authorize(creds)
-        sheet = client.open("LinkedIn Auto Connect").sheet1
-
-        # Fix deprecated method
-        try:
-            name = post.find_element(By.CSS_SELECTOR, "span.feed-shared-actor__name").text
-        except:
-            name = "Unknown"
-        
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        sheet.append_row([timestamp, name, content, decision])
-        logger.info(f"Logged to sheet: {decision} - {name}")
-        
-    except FileNotFoundError:
-        logger.warning("credentials.json not found. Logging to console instead.")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"[{timestamp}] {decision}: {content[:50]}...")
     except Exception as e:
-        logger.error(f"Error logging to sheet: {e}")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"[{timestamp}] {decision}: {content[:50]}...")
+        logger.error(f"Error recording decision locally: {e}")
+
+    if SHEETS_EXPORT:
+        export_to_sheet(name, content, decision)
+
+
+@traced()
+def export_to_sheet(name, content, decision):
+    """Queue a row for the background sheet writer; never blocks on the network"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    get_sheet_writer().enqueue([timestamp, name, content, decision])
@@ -0,0 +1,127 @@
+import gzip
+import os
+import threading
+from collections import deque
+
+BLOCK_SIZE = 64 * 1024
+
+
+def tail_lines(path, n, block_size=BLOCK_SIZE, end=None):
+    """Last n lines of a file (up to byte offset end), read backward in blocks"""
+    if n <= 0 or not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        if end is None:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+        data = b""
+        while end > 0 and data.count(b"\n") <= n:
+            start = max(0, end - block_size)
+            f.seek(start)
+            data = f.read(end - start) + data
+            end = start
+    lines = data.decode("utf-8", errors="ignore").splitlines()
+    return lines[-n:]
+
+
+def last_line_end(path, size, block_size=BLOCK_SIZE):
+    """Byte offset just past the last newline before size (0 if there is none)"""
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        end = size
+        while end > 0:
+            start = max(0, end - block_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+def archive_paths(path, max_archives=9):
+    """Rotated archives of path, newest first (path.1 or path.1.gz, ...)"""
+    found = []
+    for i in range(1, max_archives + 1):
+        for candidate in (f"{path}.{i}", f"{path}.{i}.gz"):
+            if os.path.exists(candidate):
+                found.append(candidate)
+                break
+    return found
+
+
+def _read_archive_lines(path, n):
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            lines = deque(f, maxlen=n)
+        return [line.decode("utf-8", errors="ignore").rstrip("\r\n") for line in lines]
+    return tail_lines(path, n)
+
+
+class LogTailer:
+    """Keeps the last max_lines entries of a growing log file.
+
+    The first read seeks backward from EOF; later reads resume at the
+    remembered byte offset and only parse what was appended. A changed
+    inode or a shrunk file means the log was rotated, in which case the
+    window is rebuilt from the new file and its (possibly gzipped) archives.
+    """
+
+    def __init__(self, path, max_lines=1000, parse=None):
+        self.path = path
+        self.max_lines = max_lines
+        self.parse = parse or (lambda line: line)
+        self.entries = deque(maxlen=max_lines)
+        self.offset = None
+        self.inode = None
+        self._partial = b""
+        self._lock = threading.Lock()
+
+    def _add(self, lines):
+        for line in lines:
+            line = line.strip()
+            if line:
+                self.entries.append(self.parse(line))
+
+    def _bootstrap(self, end):
+        lines = tail_lines(self.path, self.max_lines, end=end)
+        missing = self.max_lines - len(lines)
+        for archive in archive_paths(self.path):
+            if missing <= 0:
+                break
+            older = _read_archive_lines(archive, missing)
+            lines = older + lines
+            missing -= len(older)
+        self._add(lines)
+
+    def _read_new(self, f):
+        f.seek(self.offset)
+        data = self._partial + f.read()
+        self.offset = f.tell()
+        *complete, self._partial = data.split(b"\n")
+        self._add(line.decode("utf-8", errors="ignore") for line in complete)
+
+    def read(self):
+        """Return the current entries, oldest first"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return list(self.entries)
+
+            rotated = self.offset is not None and (
+                stat.st_ino != self.inode or stat.st_size < self.offset
+            )
+            if self.offset is None or rotated:
+                self.entries.clear()
+                self._partial = b""
+                # A line still being written is left for the next read to complete
+                self.offset = last_line_end(self.path, stat.st_size)
+                self._bootstrap(self.offset)
+                self.inode = stat.st_ino
+
+            if stat.st_size > self.offset:
+                with open(self.path, "rb") as f:
+                    self._read_new(f)
+            return list(self.entries)
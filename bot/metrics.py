@@ -0,0 +1,228 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from bot.tracing import span
+
+logger = logging.getLogger(__name__)
+
+METRICS_PATH = "data/metrics.prom"
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _label_str(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{v}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_label_str(self.labels, key)} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def set(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self.values[key] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_label_str(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            series = self.series.setdefault(
+                key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        with self._lock:
+            for key, series in sorted(self.series.items()):
+                for bound, c in zip(self.buckets + ("+Inf",), series["buckets"] + [series["count"]]):
+                    lines.append(f"{self.name}_bucket{_label_str(names, key + (bound,))} {c}")
+                lines.append(f"{self.name}_sum{_label_str(self.labels, key)} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{_label_str(self.labels, key)} {series['count']}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            if name not in self.metrics:
+                self.metrics[name] = cls(name, help_text, **kwargs)
+            return self.metrics[name]
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels=labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels=labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labels=labels, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=METRICS_PATH):
+        """Write the Prometheus text format atomically, e.g. for the dashboard"""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.histogram(
+    "bot_phase_seconds", "Time spent in each run_bot phase", labels=("phase",)
+)
+JOB_SECONDS = REGISTRY.histogram(
+    "bot_job_seconds", "Total duration of scheduled bot jobs", labels=("status",)
+)
+JOBS = REGISTRY.counter("bot_jobs_total", "Bot jobs run, by outcome", labels=("status",))
+SESSIONS = REGISTRY.counter(
+    "bot_sessions_total", "run_bot sessions, by outcome", labels=("outcome",)
+)
+POSTS = REGISTRY.counter("bot_posts_total", "Posts handled, by decision", labels=("decision",))
+CHROME_RETRIES = REGISTRY.counter("bot_chrome_init_retries_total", "Failed Chrome start attempts")
+WAIT_SECONDS = REGISTRY.histogram(
+    "bot_wait_seconds", "Readiness waits, by condition and outcome", labels=("wait", "outcome")
+)
+SHEET_APPEND_SECONDS = REGISTRY.histogram(
+    "bot_sheet_append_seconds", "Latency of batched Google Sheets appends"
+)
+NEAR_DUPLICATES = REGISTRY.counter(
+    "bot_near_duplicates_total", "New posts dropped as near-duplicates of earlier ones"
+)
+DEDUP_CHECKED = REGISTRY.counter(
+    "bot_dedup_checked_total", "New posts checked against the near-duplicate index"
+)
+DEDUP_RATIO = REGISTRY.gauge(
+    "bot_dedup_ratio", "Share of the last session's new posts that were near-duplicates"
+)
+
+
+@contextmanager
+def timed(histogram, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+# Phase the running session is in, polled by the bot worker for live progress
+_current_phase = None
+
+
+@contextmanager
+def phase(name):
+    """Time a block of run_bot as one phase"""
+    global _current_phase
+    _current_phase = name
+    try:
+        with timed(PHASE_SECONDS, phase=name), span(name, cat="phase"):
+            yield
+    finally:
+        _current_phase = None
+
+
+def current_phase():
+    return _current_phase
+
+
+def parse_prometheus(text):
+    """Parse exposition text into (name, labels dict, value) tuples"""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        head, _, value = line.rpartition(" ")
+        name, _, label_part = head.partition("{")
+        labels = {}
+        for pair in label_part.rstrip("}").split(","):
+            if "=" in pair:
+                key, _, val = pair.partition("=")
+                labels[key] = val.strip('"')
+        samples.append((name, labels, float(value)))
+    return samples
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Serve /metrics for this process from a daemon thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"📈 Metrics endpoint on http://{host}:{port}/metrics")
+    return server
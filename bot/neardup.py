@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NEAR_DUP_DB_PATH = "data/near_dups.db"
+TTL_SECONDS = 7 * 24 * 3600
+# Posts whose word-bigram sets have at least this (estimated) Jaccard
+# similarity count as the same post
+SIMILARITY = float(os.environ.get("BOT_NEAR_DUP_SIMILARITY", "0.6"))
+SHINGLE_SIZE = 2
+# 16 bands of 4 rows: pairs at 0.8 similarity share a band ~99.9% of the
+# time, at 0.6 ~89%, at 0.3 ~12% (and are then rejected on the full signature)
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+# Fixed permutations, so signatures stored by earlier sessions stay comparable
+_PERM_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _shingle_hashes(text):
+    words = _WORD_RE.findall(text.lower())
+    if len(words) >= SHINGLE_SIZE:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = set(words)
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") & _PRIME
+         for s in shingles),
+        dtype=np.uint64,
+    )
+
+
+def minhash(text):
+    """MinHash signature (NUM_PERM uint32 values) of the word bigrams of text,
+    or None for text without words"""
+    hashes = _shingle_hashes(text)
+    if not len(hashes):
+        return None
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+def _bands(sig):
+    data = sig.tobytes()
+    width = ROWS * sig.itemsize
+    return [data[i * width:(i + 1) * width] for i in range(BANDS)]
+
+
+class NearDupIndex:
+    """MinHash-LSH index of processed posts.
+
+    Each post's signature is split into bands held in one dict per band, so
+    a lookup is BANDS dict probes plus a check of the few candidates that
+    share a band. Signatures with a recorded decision are persisted to
+    SQLite, so reshares and copy-pasted posts are recognised across
+    sessions; posts still awaiting one are only indexed in memory, so a
+    post that fails before its decision is retried next session.
+
+    The scraper keeps one index per process: call refresh() at the start of
+    each session and forget_pending() at its end.
+    """
+
+    def __init__(self, path=NEAR_DUP_DB_PATH, threshold=SIMILARITY, ttl_seconds=TTL_SECONDS):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._buckets = [{} for _ in range(BANDS)]
+        self._entries = {}
+        self._synced_at = 0.0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " key TEXT PRIMARY KEY, sig BLOB NOT NULL, decision TEXT, seen_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS signatures_seen_at ON signatures (seen_at)")
+        self.conn.commit()
+        self.refresh()
+
+    def refresh(self):
+        """Evict expired signatures and load those stored since the last
+        refresh (e.g. by another process); resets the per-session stats"""
+        self.checked = 0
+        self.duplicates = 0
+        self.evict_expired()
+        # Rows without a decision were written before it was recorded (older
+        # versions); they would hide posts that never got processed
+        rows = self.conn.execute(
+            "SELECT key, sig, decision, seen_at FROM signatures"
+            " WHERE decision IS NOT NULL AND seen_at >= ?",
+            (self._synced_at,),
+        )
+        for key, blob, decision, seen_at in rows:
+            sig = np.frombuffer(blob, dtype=np.uint32)
+            if len(sig) == NUM_PERM:
+                self._index(key, sig, decision, seen_at)
+            self._synced_at = max(self._synced_at, seen_at)
+
+    def _index(self, key, sig, decision, seen_at):
+        self._unindex(key)
+        self._entries[key] = (sig, decision, seen_at)
+        for bucket, band in zip(self._buckets, _bands(sig)):
+            bucket.setdefault(band, set()).add(key)
+
+    def _unindex(self, key):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            for bucket, band in zip(self._buckets, _bands(old[0])):
+                bucket.get(band, set()).discard(key)
+
+    def find(self, sig, key=None):
+        """(key, decision) of an indexed near-duplicate of sig other than key, or None"""
+        self.checked += 1
+        if sig is None:
+            return None
+        tried = {key}
+        for bucket, band in zip(self._buckets, _bands(sig)):
+            for other_key in bucket.get(band, ()):
+                if other_key in tried:
+                    continue
+                tried.add(other_key)
+                other, decision, _ = self._entries[other_key]
+                if similarity(sig, other) >= self.threshold:
+                    self.duplicates += 1
+                    return other_key, decision
+        return None
+
+    def add(self, key, sig, decision=None):
+        """Index sig under key; it is persisted once decision is given"""
+        if sig is None:
+            return
+        now = time.time()
+        self._index(key, sig, decision, now)
+        if decision is None:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO signatures (key, sig, decision, seen_at) VALUES (?, ?, ?, ?)",
+            (key, sig.tobytes(), decision, now),
+        )
+        self.conn.commit()
+
+    def forget_pending(self):
+        """Drop in-memory entries whose post never got a decision"""
+        pending = [key for key, entry in self._entries.items() if entry[1] is None]
+        for key in pending:
+            self._unindex(key)
+        return len(pending)
+
+    def evict_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        cur = self.conn.execute("DELETE FROM signatures WHERE seen_at < ?", (cutoff,))
+        self.conn.commit()
+        for key in [k for k, entry in self._entries.items() if entry[2] < cutoff]:
+            self._unindex(key)
+        if cur.rowcount:
+            logger.info(f"🧹 Evicted {cur.rowcount} expired near-duplicate signatures")
+        return cur.rowcount
+
+    def stats(self):
+        return {
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "dedup_ratio": self.duplicates / self.checked if self.checked else 0.0,
+            "indexed": len(self._entries),
+        }
+
+    def close(self):
+        self.conn.close()
@@ -1,16 +1,171 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+import hashlib
+import json
+import math
+import os
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+MODEL_DIR = "config/scorer"
+CORPUS_PATH = "config/corpus.txt"
+
+
+def load_corpus(path=CORPUS_PATH):
+    """Read the reference corpus, one post per line"""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def corpus_hash(corpus):
+    """Fingerprint of a reference corpus, saved with the artifact fitted on it"""
+    digest = hashlib.sha256()
+    for line in corpus:
+        digest.update(line.encode("utf-8", errors="ignore") + b"\n")
+    return digest.hexdigest()
+
 
 class PostScorer:
-    def __init__(self, prompt):
-        self.prompt = prompt
+    def __init__(self, prompts):
+        # One prompt or a list of them; scores come back one column per prompt
+        self.prompts = [prompts] if isinstance(prompts, str) else list(prompts)
+        self.prompt = self.prompts[0]
         self.vectorizer = TfidfVectorizer(stop_words="english")
+        # Set by fit() or load(); when present, scoring is transform-only
+        self.counter = None
+        self.idf = None
+        self.prompt_matrix = None
+        # IDF of a term the fitted corpus never saw (smooth IDF with df=0)
+        self.oov_idf = None
+        self.corpus_hash = None
+        self._analyze = None
 
-    def score_posts(self, posts):
-        texts = [self.prompt] + posts
+    @property
+    def is_fitted(self):
+        return self.prompt_matrix is not None
+
+    def fit(self, corpus=()):
+        """Fit vocabulary and IDF once on the prompts plus a reference corpus"""
+        corpus = list(corpus)
+        self.vectorizer.fit(self.prompts + corpus)
+        self.counter = CountVectorizer(
+            stop_words="english", vocabulary=self.vectorizer.vocabulary_
+        )
+        self.idf = self.vectorizer.idf_.astype(np.float64)
+        self.oov_idf = math.log(len(self.prompts) + len(corpus) + 1) + 1
+        self.corpus_hash = corpus_hash(corpus)
+        self.prompt_matrix = self.transform(self.prompts)
+        return self
+
+    def _counts(self, posts):
+        """Term counts over the fitted vocabulary, plus the summed squared
+        counts of each post's out-of-vocabulary terms, from one tokenising pass"""
+        if self._analyze is None:
+            self._analyze = self.counter.build_analyzer()
+        analyze, vocabulary = self._analyze, self.counter.vocabulary
+        indptr, indices, data = [0], [], []
+        oov = np.zeros(len(posts))
+        for i, text in enumerate(posts):
+            mass = 0
+            for term, tf in Counter(analyze(text)).items():
+                column = vocabulary.get(term)
+                if column is None:
+                    mass += tf * tf
+                else:
+                    indices.append(column)
+                    data.append(tf)
+            oov[i] = mass
+            indptr.append(len(indices))
+        counts = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(posts), len(vocabulary)),
+        )
+        return counts, oov
+
+    def transform(self, posts):
+        """L2-normalised TF-IDF vectors over the fitted vocabulary.
+
+        Terms outside the vocabulary have no column, but their weight still
+        counts towards each post's norm, so off-topic text lowers the cosine
+        just as it does when the vectorizer is fitted on the posts themselves.
+        """
+        counts, oov = self._counts(posts)
+        weighted = counts.multiply(self.idf).tocsr()
+        norms = np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel()
+        norms = np.sqrt(norms + oov * self.oov_idf ** 2)
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ weighted
+
+    def save(self, path=MODEL_DIR):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "vocabulary.json"), "w", encoding="utf-8") as f:
+            json.dump({k: int(v) for k, v in self.counter.vocabulary.items()}, f)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"prompts": self.prompts, "oov_idf": self.oov_idf,
+                       "corpus_hash": self.corpus_hash}, f)
+        np.save(os.path.join(path, "idf.npy"), self.idf)
+        np.save(os.path.join(path, "prompt_data.npy"), self.prompt_matrix.data)
+        np.save(os.path.join(path, "prompt_indices.npy"), self.prompt_matrix.indices)
+        np.save(os.path.join(path, "prompt_indptr.npy"), self.prompt_matrix.indptr)
+
+    @classmethod
+    def load(cls, path=MODEL_DIR):
+        """Load a fitted artifact; the arrays are memory-mapped, not copied"""
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "vocabulary.json"), "r", encoding="utf-8") as f:
+            vocabulary = json.load(f)
+
+        def _array(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+        scorer = cls(meta["prompts"])
+        scorer.counter = CountVectorizer(stop_words="english", vocabulary=vocabulary)
+        scorer.idf = _array("idf")
+        scorer.oov_idf = meta["oov_idf"]
+        scorer.corpus_hash = meta["corpus_hash"]
+        indptr = _array("prompt_indptr")
+        scorer.prompt_matrix = sparse.csr_matrix(
+            (_array("prompt_data"), _array("prompt_indices"), indptr),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+        return scorer
+
+    @classmethod
+    def load_or_fit(cls, prompts, path=MODEL_DIR, corpus_path=CORPUS_PATH):
+        """Reuse the saved artifact for these prompts and this reference corpus,
+        fitting and saving it if missing or stale"""
+        wanted = cls(prompts).prompts
+        corpus = load_corpus(corpus_path)
+        try:
+            scorer = cls.load(path)
+            if scorer.prompts == wanted and scorer.corpus_hash == corpus_hash(corpus):
+                return scorer
+        except (OSError, ValueError, KeyError):
+            pass
+        scorer = cls(wanted).fit(corpus)
+        scorer.save(path)
+        return scorer
+
+    def score_matrix(self, posts):
+        """Cosine scores of shape (len(posts), len(prompts)) from one sparse product"""
+        if self.is_fitted:
+            post_vecs = self.transform(posts)
+            return (post_vecs @ self.prompt_matrix.T).toarray()
+
+        texts = self.prompts + posts
         tfidf_matrix = self.vectorizer.fit_transform(texts)
-        prompt_vec = tfidf_matrix[0]
-        post_vecs = tfidf_matrix[1:]
-        scores = cosine_similarity(prompt_vec, post_vecs)[0]
-        return scores
+        prompt_vecs = tfidf_matrix[: len(self.prompts)]
+        post_vecs = tfidf_matrix[len(self.prompts):]
+        return cosine_similarity(post_vecs, prompt_vecs, dense_output=True)
+
+    def refresh(self):
+        """TF-IDF statistics are fixed at fit time; nothing to catch up on"""
+        return 0
+
+    def score_posts(self, posts):
+        """Best score per post across all prompts"""
+        return self.score_matrix(posts).max(axis=1)
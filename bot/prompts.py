@@ -0,0 +1,10 @@
+# Targeting prompts by id, each with its own threshold per scoring backend
+# (BOT_SCORER; the scales differ). Kept free of heavy imports so the dashboard
+# can show them without loading the bot.
+PROMPTS = {
+    "swe_hiring": "I want to connect to people who are hiring for Software Engineer roles with experience of more than 1 year",
+}
+THRESHOLDS = {
+    "tfidf": {"swe_hiring": 0.15},
+    "bm25": {"swe_hiring": 0.05},
+}
@@ -0,0 +1,101 @@
+import logging
+import os
+import threading
+import time
+from bot.procutil import cpu_seconds, process_tree, rss_bytes
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = float(os.environ.get("BOT_RESOURCE_SAMPLE_SECONDS", "1"))
+# Abort a session whose Chrome process tree goes over this many MB; 0 disables
+MEMORY_CEILING_MB = float(os.environ.get("BOT_MEMORY_CEILING_MB", "0"))
+
+
+class MemoryCeilingExceeded(Exception):
+    """Chrome's process tree went over the configured memory ceiling"""
+
+    def __init__(self, rss_mb, ceiling_mb):
+        super().__init__(f"Chrome RSS {rss_mb:.0f} MB over the {ceiling_mb:.0f} MB ceiling")
+        self.rss_mb = rss_mb
+        self.ceiling_mb = ceiling_mb
+
+
+class ResourceSampler:
+    """Samples RSS, CPU time and process count of a process tree from /proc.
+
+    Runs in a background thread for the length of one session. CPU time is
+    counted from when sampling started, so a warm Chrome reused across
+    sessions is only charged for this one.
+    """
+
+    def __init__(self, root_pid, interval=SAMPLE_INTERVAL, ceiling_mb=MEMORY_CEILING_MB):
+        self.root_pid = root_pid
+        self.interval = interval
+        self.ceiling_mb = ceiling_mb
+        self.samples = 0
+        self.rss_total = 0
+        self.peak_rss = 0
+        self.peak_procs = 0
+        self.started = None
+        self.duration = 0.0
+        self.exceeded_mb = None
+        self._cpu_start = {}
+        self._cpu_last = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        pids = process_tree(self.root_pid)
+        rss = 0
+        for pid in pids:
+            rss += rss_bytes(pid)
+            cpu = cpu_seconds(pid)
+            self._cpu_start.setdefault(pid, cpu if self.samples == 0 else 0.0)
+            self._cpu_last[pid] = cpu
+        self.samples += 1
+        self.rss_total += rss
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_procs = max(self.peak_procs, len(pids))
+        rss_mb = rss / (1024 * 1024)
+        if self.ceiling_mb and rss_mb > self.ceiling_mb and self.exceeded_mb is None:
+            self.exceeded_mb = rss_mb
+            logger.warning(f"🧠 Chrome RSS {rss_mb:.0f} MB is over the {self.ceiling_mb:.0f} MB ceiling")
+        return rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.started = time.time()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sample()
+        self.duration = time.time() - self.started
+        return self.summary()
+
+    def check(self):
+        """Raise MemoryCeilingExceeded once a sample has crossed the ceiling"""
+        if self.exceeded_mb is not None:
+            raise MemoryCeilingExceeded(self.exceeded_mb, self.ceiling_mb)
+
+    def cpu_seconds(self):
+        return sum(self._cpu_last[pid] - self._cpu_start[pid] for pid in self._cpu_last)
+
+    def summary(self):
+        mb = 1024 * 1024
+        return {
+            "duration_s": self.duration,
+            "peak_rss_mb": self.peak_rss / mb,
+            "avg_rss_mb": self.rss_total / self.samples / mb if self.samples else 0.0,
+            "cpu_seconds": self.cpu_seconds(),
+            "peak_procs": self.peak_procs,
+            "samples": self.samples,
+        }
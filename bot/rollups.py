@@ -0,0 +1,164 @@
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+ROLLUP_DB_PATH = "data/rollups.db"
+# Minute and hour buckets start on epoch multiples; day buckets at local midnight
+BUCKET_SECONDS = {"minute": 60, "hour": 3600}
+BUCKETS = ("minute", "hour", "day")
+# Fine-grained buckets are only needed for recent windows
+RETENTION_SECONDS = {"minute": 2 * 86400, "hour": 90 * 86400}
+FLUSH_SECONDS = 2.0
+
+
+def bucket_start(ts, bucket):
+    if bucket == "day":
+        t = time.localtime(ts)
+        return time.mktime((t.tm_year, t.tm_mon, t.tm_mday, 0, 0, 0, 0, 0, -1))
+    size = BUCKET_SECONDS[bucket]
+    return ts - ts % size
+
+
+def create_rollup_table(conn, table, label):
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {table} ("
+        f" bucket TEXT NOT NULL,"
+        f" start REAL NOT NULL,"
+        f" {label} TEXT NOT NULL,"
+        f" count INTEGER NOT NULL,"
+        f" PRIMARY KEY (bucket, start, {label}))"
+    )
+
+
+def add_to_rollup(conn, table, label, counts):
+    """Add {(bucket, start, label value): n} to the rollup table; caller commits"""
+    conn.executemany(
+        f"INSERT INTO {table} (bucket, start, {label}, count) VALUES (?, ?, ?, ?)"
+        f" ON CONFLICT (bucket, start, {label}) DO UPDATE SET count = count + excluded.count",
+        [(bucket, start, value, n) for (bucket, start, value), n in counts.items()],
+    )
+
+
+def rollup_counts(ts, value, n=1):
+    return {(bucket, bucket_start(ts, bucket), value): n for bucket in BUCKETS}
+
+
+def total_bucket(since):
+    """Finest bucket size still kept for a window starting at `since`"""
+    if since is None:
+        return "day"
+    age = time.time() - since
+    for bucket, keep in RETENTION_SECONDS.items():
+        if age <= keep:
+            return bucket
+    return "day"
+
+
+def query_rollup(conn, table, label, bucket, since=None, until=None, value=None):
+    """(start, label value, count) rows for one bucket size, oldest first"""
+    sql = f"SELECT start, {label}, count FROM {table} WHERE bucket = ?"
+    params = [bucket]
+    if since is not None:
+        sql += " AND start >= ?"
+        params.append(bucket_start(since, bucket))
+    if until is not None:
+        sql += " AND start < ?"
+        params.append(until)
+    if value is not None:
+        sql += f" AND {label} = ?"
+        params.append(value)
+    return conn.execute(sql + " ORDER BY start", params).fetchall()
+
+
+def prune_rollup(conn, table, now=None):
+    now = time.time() if now is None else now
+    for bucket, keep in RETENTION_SECONDS.items():
+        conn.execute(f"DELETE FROM {table} WHERE bucket = ? AND start < ?", (bucket, now - keep))
+
+
+class LogRollup:
+    """Log record counts per minute/hour/day and level, in SQLite (WAL mode)"""
+
+    def __init__(self, path=ROLLUP_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        create_rollup_table(self.conn, "log_rollup", "level")
+        self.conn.commit()
+
+    def add(self, counts):
+        with self._lock:
+            add_to_rollup(self.conn, "log_rollup", "level", counts)
+            prune_rollup(self.conn, "log_rollup")
+            self.conn.commit()
+
+    def query(self, bucket, since=None, until=None, level=None):
+        with self._lock:
+            return query_rollup(self.conn, "log_rollup", "level", bucket, since, until, level)
+
+    def total(self, since=None, level=None):
+        """Records since `since` (whole buckets), summed from the rollup"""
+        return sum(row[2] for row in self.query(total_bucket(since), since=since, level=level))
+
+    def version(self):
+        """Changes whenever another connection (the bot's handler) commits"""
+        with self._lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class LogRollupHandler(logging.Handler):
+    """Counts every log record into the log rollup; a background thread
+    writes the counts every flush_seconds, so emit never touches SQLite"""
+
+    def __init__(self, path=ROLLUP_DB_PATH, flush_seconds=FLUSH_SECONDS):
+        super().__init__()
+        self.rollup = LogRollup(path)
+        self.flush_seconds = flush_seconds
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-rollup", daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            for key, n in rollup_counts(record.created, record.levelname).items():
+                self._pending[key] = self._pending.get(key, 0) + n
+        except Exception:
+            self.handleError(record)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                # Logging from here would feed the handler it is flushing
+                sys.stderr.write(f"⚠️ Could not write log rollup: {e}\n")
+
+    def flush(self):
+        self.acquire()
+        try:
+            pending, self._pending = self._pending, {}
+        finally:
+            self.release()
+        if pending:
+            self.rollup.add(pending)
+
+    def close(self):
+        try:
+            self._stop.set()
+            if self._thread.is_alive() and self._thread is not threading.current_thread():
+                self._thread.join()
+            self.flush()
+            self.rollup.close()
+        finally:
+            super().close()
@@ -1,143 +1,335 @@
+import atexit
 import time
-import pickle
 import random
 import logging
 import os
-import uuid
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from bot.connect import try_connect
-from bot.decision import DecisionEngine
-from bot.logger import log_to_sheet
+from selenium.common.exceptions import TimeoutException
+from bot.auth import load_cookies, preflight, record_auth_result
+from bot.browser import DriverManager
+from bot.connect import connect_post
+from bot.extract import extract_posts
+from bot.logger import get_store, record_decision
 from bot.humanizer import random_click, random_scroll
+from bot.jsonlog import new_session
+from bot import metrics
+from bot.metrics import phase
+from bot.resources import MemoryCeilingExceeded, ResourceSampler
+from bot.neardup import NearDupIndex, minhash
+from bot.prompts import PROMPTS, THRESHOLDS
+from bot.seen_index import SeenIndex, post_key
+from bot.tracing import span, trace_session
+from bot.waits import AuthRedirect, wait_for_feed, wait_ready
 
 logger = logging.getLogger(__name__)
 
-PROMPT = "I want to connect to people who are hiring for Software Engineer roles with experience of more than 1 year"
-decision_engine = DecisionEngine(PROMPT)
+# Scoring backend, see bot.decision.SCORERS
+SCORER = os.environ.get("BOT_SCORER", "tfidf")
 
+# Check the cookie jar before starting Chrome (see bot.auth)
+AUTH_PREFLIGHT = os.environ.get("BOT_AUTH_PREFLIGHT", "1") != "0"
 
-def run_bot():
-    logger.info("🔁 Starting LinkedIn bot session...")
+# Overridable so benchmarks can point the bot at a local feed stand-in
+LINKEDIN_URL = os.environ.get("BOT_LINKEDIN_URL", "https://www.linkedin.com")
 
-    # Kill chrome processes
-    os.system("pkill -f chrome || true")
-    logger.info("🛑 Killed any existing Chrome processes")
-    time.sleep(1)
+# Built on first use: bot.decision pulls in numpy/scipy/scikit-learn, which
+# importers of this module (the dashboard, fab tasks) should not pay for
+_decision_engine = None
 
-    chrome_options = Options()
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-    chrome_options.add_argument("--js-flags=--max-old-space-size=512")
 
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
+def get_decision_engine():
+    global _decision_engine
+    if _decision_engine is None:
+        from bot.decision import DecisionEngine
 
-    # Anti-detection and unique profile
-    chrome_options.add_argument(f"--user-data-dir=/tmp/profile_{uuid.uuid4()}")
-    chrome_options.add_argument(
-        "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        _decision_engine = DecisionEngine(PROMPTS, THRESHOLDS, scorer=SCORER)
+    return _decision_engine
+
+
+# Kept for the life of the process, like the warm Chrome session: the seen
+# index's LRU and the loaded near-duplicate signatures carry over between
+# sessions instead of being rebuilt from SQLite each time
+_seen_index = None
+_near_dups = None
+
+
+def get_indexes():
+    """The process-wide seen-post and near-duplicate indexes"""
+    global _seen_index, _near_dups
+    if _seen_index is None:
+        _seen_index = SeenIndex()
+        _near_dups = NearDupIndex()
+        atexit.register(close_indexes)
+    return _seen_index, _near_dups
+
+
+def close_indexes():
+    global _seen_index, _near_dups
+    if _seen_index is not None:
+        _seen_index.close()
+        _near_dups.close()
+        _seen_index = _near_dups = None
+
+
+def record_resources(session_id, outcome, usage):
+    """Log a session's Chrome resource usage and keep it in the local store"""
+    logger.info(
+        f"🧠 Chrome peak {usage['peak_rss_mb']:.0f} MB, avg {usage['avg_rss_mb']:.0f} MB, "
+        f"{usage['cpu_seconds']:.1f} CPU s, {usage['peak_procs']} processes",
+        extra={"event": "resources", **usage},
     )
+    try:
+        get_store().record_session_resources(session_id, outcome, **usage)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record resource usage: {e}")
+
 
-    # Headless mode for EC2
-    chrome_options.add_argument("--headless=new")
+def run_bot(driver_manager=None):
+    """Run one bot session.
+
+    With a driver_manager (see bot.browser.DriverManager) the warm Chrome
+    session is reused and handed back afterwards; without one, a
+    throwaway session is started and closed for this run only. With
+    BOT_TRACE=1 the session's spans are written to a trace file (bot.tracing).
+    """
+    session_id = new_session()
+    with trace_session(session_id), span("run_bot", session=session_id):
+        _run_session(session_id, driver_manager)
+
+
+def _run_session(session_id, driver_manager):
+    logger.info(f"🔁 Starting LinkedIn bot session {session_id}...", extra={"event": "session_start"})
+
+    owns_manager = driver_manager is None
+    if owns_manager:
+        driver_manager = DriverManager(max_runs=1)
 
     driver = None
+    sampler = None
+    near_dups = None
+    outcome = "error"
     try:
-        service = Service()
-        for attempt in range(3):
-            try:
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-                driver.execute_script(
-                    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-                )
-                logger.info("✅ Chrome driver initialized")
-                break
-            except Exception as e:
-                logger.warning(f"Retry {attempt+1}/3 - Chrome init failed: {e}")
-                time.sleep(2)
-
-        if not driver:
-            raise Exception("Failed to initialize Chrome after 3 attempts")
-
-        # Load LinkedIn and inject cookies
-        driver.get("https://www.linkedin.com/")
-
-        time.sleep(3)
+        # Expired or already-rejected cookies fail here, before Chrome starts
+        auth = {"ok": True, "expires_at": None}
+        if AUTH_PREFLIGHT:
+            with phase("auth_preflight"):
+                auth = preflight()
+        if not auth["ok"]:
+            logger.warning(
+                f"🔒 Skipping bot run, auth pre-flight failed: {auth['message']}",
+                extra={"event": "auth_preflight", "reason": auth["reason"]},
+            )
+            outcome = "auth_preflight"
+            return
+
+        seen_index, near_dups = get_indexes()
+        seen_index.start_session()
+        near_dups.refresh()
+        with phase("chrome_start"):
+            driver = driver_manager.acquire()
+        sampler = ResourceSampler(driver_manager.service_pid).start()
+
+        # Load LinkedIn and inject cookies; a warm session already has them
+        if driver_manager.fresh:
+            with phase("home_load"):
+                driver.get(f"{LINKEDIN_URL}/")
+
+            with phase("home_ready"):
+                wait_ready(driver)
+            with phase("cookie_inject"):
+                try:
+                    for cookie in load_cookies():
+                        driver.add_cookie(cookie)
+                    logger.info("🍪 Cookies injected")
+                except FileNotFoundError:
+                    logger.warning("⚠️ cookies.pkl not found. Manual login may be required.")
+                except Exception as e:
+                    logger.warning(f"⚠️ Cookie injection failed: {e}")
+
+        with phase("feed_load"):
+            driver.get(f"{LINKEDIN_URL}/feed/")
+
         try:
-            with open("config/cookies.pkl", "rb") as f:
-                cookies = pickle.load(f)
-                for cookie in cookies:
-                    driver.add_cookie(cookie)
-            logger.info("🍪 Cookies injected")
-        except FileNotFoundError:
-            logger.warning("⚠️ cookies.pkl not found. Manual login may be required.")
-        except Exception as e:
-            logger.warning(f"⚠️ Cookie injection failed: {e}")
-
-        driver.get("https://www.linkedin.com/feed/")
-
-        current_url = driver.current_url
-        if "login" in current_url or "checkpoint" in current_url:
-            logger.warning(f"🔒 Not logged in — redirected to: {current_url}")
+            with phase("feed_ready"):
+                posts = wait_for_feed(driver)
+        except AuthRedirect as e:
+            logger.warning(f"🔒 Not logged in — redirected to: {e.url}")
             logger.warning("❌ Skipping bot run due to unauthenticated session")
+            record_auth_result("rejected", f"LinkedIn redirected to {e.url}", url=e.url)
+            outcome = "unauthenticated"
+            return
+        except TimeoutException:
+            logger.warning(f"⌛ No feed posts appeared at {driver.current_url}, skipping run")
+            outcome = "feed_timeout"
             return
-        else:
-            logger.info(f"✅ Logged in. Landed on: {current_url}")
 
+        logger.info(f"✅ Logged in. Landed on: {driver.current_url}")
+        record_auth_result("ok", "feed loaded with the current cookies", expires_at=auth["expires_at"])
         logger.info("➡️ Navigated to LinkedIn feed")
-        time.sleep(4)
+        logger.info(
+            f"📄 Found {len(posts)} posts to process",
+            extra={"event": "feed_loaded", "posts": len(posts)},
+        )
 
-        posts = driver.find_elements(By.CLASS_NAME, "feed-shared-update-v2")
-        logger.info(f"📄 Found {len(posts)} posts to process")
+        # One round trip returns every post's id, text, actor and Connect
+        # button; drop posts processed in earlier sessions, then score the
+        # remaining texts in one call
+        sampler.check()
+        with phase("extract"):
+            records = extract_posts(driver)
+
+        fresh, keys = [], []
+        for record in records:
+            urn = record["urn"]
+            if urn and seen_index.seen(urn):
+                continue
+            key = post_key(urn, record["text"])
+            if not urn and seen_index.seen(key):
+                continue
+            fresh.append(record)
+            keys.append(key)
+
+        stats = seen_index.stats()
+        logger.info(
+            f"👀 {len(fresh)} new posts, {stats['hits']} already seen "
+            f"(hit rate {stats['hit_rate']:.0%})",
+            extra={"event": "seen_filter", "fresh": len(fresh), "seen": stats["hits"]},
+        )
+
+        # Reshares and copy-pasted posts: reuse the earlier post's decision
+        # instead of scoring, connecting and recording them again
+        with phase("dedup"):
+            posts, unique_keys, signatures = [], [], []
+            for record, key in zip(fresh, keys):
+                sig = minhash(record["text"])
+                match = near_dups.find(sig, key)
+                if match is not None:
+                    seen_index.add(key, match[1] or "Duplicate")
+                    logger.info(
+                        f"🪞 Near-duplicate of {match[0]} ({match[1] or 'this session'}), skipping",
+                        extra={"event": "near_duplicate", "key": key, "original": match[0]},
+                    )
+                    continue
+                # In memory only until its decision is recorded below
+                near_dups.add(key, sig)
+                posts.append(record)
+                unique_keys.append(key)
+                signatures.append(sig)
+            keys = unique_keys
+        dedup = near_dups.stats()
+        metrics.DEDUP_CHECKED.inc(dedup["checked"])
+        metrics.NEAR_DUPLICATES.inc(dedup["duplicates"])
+        metrics.DEDUP_RATIO.set(round(dedup["dedup_ratio"], 4))
+        if dedup["duplicates"]:
+            logger.info(
+                f"🪞 Dropped {dedup['duplicates']} near-duplicate posts "
+                f"(dedup ratio {dedup['dedup_ratio']:.0%})",
+                extra={"event": "dedup", "duplicates": dedup["duplicates"]},
+            )
+        contents = [record["text"] for record in posts]
+
+        with phase("scoring"):
+            decision_engine = get_decision_engine()
+            decision_engine.refresh()
+            batch = decision_engine.score_batch(contents)
+        logger.info(
+            f"🧮 Scored {len(contents)} posts against {len(PROMPTS)} prompts, "
+            f"{int(batch.mask.sum())} selected",
+            extra={"event": "scored", "posts": len(contents), "selected": int(batch.mask.sum())},
+        )
 
         processed = connected = 0
 
         for i, post in enumerate(posts, 1):
-            try:
-                logger.info(f"📌 Processing post {i}/{len(posts)}")
-                random_scroll(driver)
-                random_click(driver)
-
-                content = post.text[:300]
-                result = decision_engine.get_relevant_posts([content])
-                should_connect = result[0]["should_connect"] if result else False
-
-                if should_connect:
-                    logger.info("🤝 Decision: Attempting to connect")
-                    if try_connect(post):
-                        log_to_sheet(post, content, "Connected")
+            with span("post", post=i):
+                sampler.check()
+                started = time.perf_counter()
+                content = contents[i - 1]
+                score = float(batch.scores[i - 1])
+                prompt_id = decision_engine.prompt_ids[batch.prompt[i - 1]]
+                try:
+                    logger.info(
+                        f"📌 Processing post {i}/{len(posts)}",
+                        extra={"event": "post_start", "post": i, "total": len(posts), "score": score},
+                    )
+
+                    name = post["name"] or "Unknown"
+                    if not batch.mask[i - 1]:
+                        with phase("record"):
+                            record_decision(
+                                name, content, "Skipped", post_id=keys[i - 1], score=score,
+                                prompt=prompt_id,
+                                latency_ms=(time.perf_counter() - started) * 1000,
+                            )
+                            seen_index.add(keys[i - 1], "Skipped")
+                            near_dups.add(keys[i - 1], signatures[i - 1], "Skipped")
+                        metrics.POSTS.inc(decision="Skipped")
+                        logger.info("⏩ Skipped post", extra={"event": "skipped", "post": i})
+                        processed += 1
+                        continue
+
+                    with phase("humanize"):
+                        random_scroll(driver)
+                        random_click(driver)
+
+                    logger.info(f"🤝 Decision: Attempting to connect (matched {prompt_id})")
+                    with phase("connect"):
+                        clicked = connect_post(driver, post)
+                    if clicked:
+                        decision = "Connected"
                         connected += 1
-                        logger.info("✅ Connected")
+                        logger.info("✅ Connected", extra={"event": "connected", "post": i})
                     else:
-                        log_to_sheet(post, content, "Connect Not Found")
-                        logger.info("❌ Connect button not found")
-                else:
-                    log_to_sheet(post, content, "Skipped")
-                    logger.info("⏩ Skipped post")
+                        decision = "Connect Not Found"
+                        logger.info(
+                            "❌ Connect button not found",
+                            extra={"event": "connect_not_found", "post": i},
+                        )
+                    with phase("record"):
+                        record_decision(
+                            name, content, decision, post_id=keys[i - 1], score=score,
+                            prompt=prompt_id,
+                            latency_ms=(time.perf_counter() - started) * 1000,
+                        )
+                        seen_index.add(keys[i - 1], decision)
+                        near_dups.add(keys[i - 1], signatures[i - 1], decision)
+                    metrics.POSTS.inc(decision=decision)
 
-                processed += 1
-                time.sleep(random.uniform(3, 7))
+                    processed += 1
+                    with phase("sleep"):
+                        time.sleep(random.uniform(3, 7))
 
-            except Exception as e:
-                logger.error(f"⚠️ Error processing post {i}: {e}")
-                continue
+                except Exception as e:
+                    logger.error(
+                        f"⚠️ Error processing post {i}: {e}", extra={"event": "post_error", "post": i}
+                    )
+                    continue
 
         logger.info(
-            f"🏁 Session completed. Processed: {processed}, Connected: {connected}"
+            f"🏁 Session completed. Processed: {processed}, Connected: {connected}",
+            extra={"event": "session_end", "processed": processed, "connected": connected},
         )
+        outcome = "completed"
+
+    except MemoryCeilingExceeded as e:
+        logger.warning(f"🧠 Aborting session: {e}", extra={"event": "memory_ceiling"})
+        outcome = "memory_ceiling"
 
     except Exception as e:
-        logger.error(f"❌ Bot execution failed: {e}")
+        logger.error(f"❌ Bot execution failed: {e}", extra={"event": "session_error"})
 
     finally:
+        if near_dups is not None:
+            near_dups.forget_pending()
+        if sampler is not None:
+            record_resources(session_id, outcome, sampler.stop())
         if driver:
-            driver.quit()
-            logger.info("🛑 Chrome closed cleanly")
+            with phase("chrome_release"):
+                if owns_manager:
+                    driver_manager.close()
+                else:
+                    driver_manager.release(failed=outcome != "completed")
+        metrics.SESSIONS.inc(outcome=outcome)
+        try:
+            metrics.REGISTRY.write()
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write metrics: {e}")
@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SEEN_DB_PATH = "data/seen_posts.db"
+TTL_SECONDS = 7 * 24 * 3600
+LRU_SIZE = 2048
+
+
+def post_key(urn, content):
+    """Stable key for a post: its update URN, or a hash of its text"""
+    if urn:
+        return urn
+    digest = hashlib.sha1(content.encode("utf-8", errors="ignore")).hexdigest()
+    return f"sha1:{digest}"
+
+
+class SeenIndex:
+    """SQLite-backed set of processed posts with an in-memory LRU in front.
+
+    The scraper keeps one index per process, so the LRU carries over
+    between sessions; call start_session() at the start of each one.
+    """
+
+    def __init__(self, path=SEEN_DB_PATH, ttl_seconds=TTL_SECONDS, lru_size=LRU_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.lru_size = lru_size
+        self.hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " key TEXT PRIMARY KEY, seen_at REAL NOT NULL, decision TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)")
+        self.conn.commit()
+        self.evict_expired()
+
+    def start_session(self):
+        """Evict expired posts and reset the per-session hit/miss counts"""
+        self.hits = 0
+        self.misses = 0
+        self.evict_expired()
+
+    def _remember(self, key, seen_at):
+        self._lru[key] = seen_at
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def seen(self, key):
+        """True if key was processed within the TTL; counts a hit or a miss"""
+        cutoff = time.time() - self.ttl_seconds
+        seen_at = self._lru.get(key)
+        if seen_at is None:
+            row = self.conn.execute(
+                "SELECT seen_at FROM seen WHERE key = ?", (key,)
+            ).fetchone()
+            seen_at = row[0] if row else None
+
+        if seen_at is not None and seen_at >= cutoff:
+            self._remember(key, seen_at)
+            self.hits += 1
+            return True
+        self._lru.pop(key, None)
+        self.misses += 1
+        return False
+
+    def add(self, key, decision=None):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO seen (key, seen_at, decision) VALUES (?, ?, ?)",
+            (key, now, decision),
+        )
+        self.conn.commit()
+        self._remember(key, now)
+
+    def evict_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        cur = self.conn.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,))
+        self.conn.commit()
+        for key in [k for k, ts in self._lru.items() if ts < cutoff]:
+            del self._lru[key]
+        if cur.rowcount:
+            logger.info(f"🧹 Evicted {cur.rowcount} expired seen-post entries")
+        return cur.rowcount
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "cached": len(self._lru),
+        }
+
+    def close(self):
+        self.conn.close()
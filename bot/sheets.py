@@ -0,0 +1,248 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from bot import metrics
+
+logger = logging.getLogger(__name__)
+
+CREDENTIALS_PATH = "config/credentials.json"
+SHEET_NAME = "LinkedIn Auto Connect"
+SPILL_PATH = "data/sheet_spill.jsonl"
+SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+def default_client():
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_PATH, SCOPE)
+    return gspread.authorize(creds)
+
+
+def _is_retryable(error):
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+
+class SheetWriter:
+    """Queues sheet rows and appends them from a background thread in batches"""
+
+    def __init__(self, client_factory=default_client, sheet_name=SHEET_NAME,
+                 batch_size=25, flush_interval=15.0, spill_path=SPILL_PATH,
+                 max_retries=5, backoff_base=1.0, backoff_max=60.0):
+        self.client_factory = client_factory
+        self.sheet_name = sheet_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.rows_sent = 0
+        self.rows_spilled = 0
+        self._queue = queue.Queue()
+        self._worksheet = None
+        self._disabled = False
+        self._stop = threading.Event()
+        self._stop_by = 0.0
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        for row in self._load_spill():
+            self._queue.put(row)
+        self._thread = threading.Thread(target=self._run, name="sheet-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, row):
+        self._queue.put(list(row))
+
+    def stop(self, timeout=30.0):
+        """Flush what is queued; anything that cannot be sent is spilled to disk.
+
+        Retries still running are given half of timeout to finish; past that
+        the writer thread spills its batch instead of backing off again.
+        """
+        self._stop_by = time.monotonic() + timeout / 2
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"Sheet writer still busy after {timeout:.0f}s; its current batch may be lost")
+            self._thread = None
+        leftover = self._drain()
+        if leftover:
+            self._spill(leftover)
+
+    def _drain(self, limit=None):
+        rows = []
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = 0.5 if deadline is None else max(0.0, min(0.5, deadline - time.monotonic()))
+            try:
+                pending.append(self._queue.get(timeout=timeout))
+                pending.extend(self._drain(self.batch_size - len(pending)))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if pending and (len(pending) >= self.batch_size or due or self._stop.is_set()):
+                self._send(pending)
+                pending, deadline = [], None
+            if self._stop.is_set() and self._queue.empty() and not pending:
+                return
+
+    def _get_worksheet(self):
+        if self._worksheet is None:
+            self._worksheet = self.client_factory().open(self.sheet_name).sheet1
+        return self._worksheet
+
+    def _send(self, rows):
+        if self._disabled:
+            for row in rows:
+                logger.info(f"[{row[0]}] {row[-1]}: {str(row[-2])[:50]}...")
+            return
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with metrics.timed(metrics.SHEET_APPEND_SECONDS):
+                    self._get_worksheet().append_rows(rows, value_input_option="RAW")
+                self.rows_sent += len(rows)
+                logger.info(f"Logged {len(rows)} rows to sheet")
+                return
+            except FileNotFoundError:
+                logger.warning("credentials.json not found. Logging to console instead.")
+                self._disabled = True
+                return self._send(rows)
+            except Exception as e:
+                if not _is_retryable(e) or attempt == self.max_retries:
+                    logger.error(f"Error logging to sheet: {e}")
+                    break
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning(f"Sheet append failed ({e}), retrying in {delay:.1f}s")
+                if getattr(e, "response", None) is None:
+                    # Connection-level failure: re-authorize on the next attempt
+                    self._worksheet = None
+                if not self._backoff(delay):
+                    break
+        self._spill(rows)
+
+    def _backoff(self, delay):
+        """Sleep before a retry; False once stopping and the retry would not
+        finish before stop() gives up on the thread"""
+        started = time.monotonic()
+        if not self._stop.wait(delay):
+            return True
+        delay -= time.monotonic() - started
+        if time.monotonic() + delay > self._stop_by:
+            return False
+        time.sleep(max(0.0, delay))
+        return True
+
+    def _spill(self, rows):
+        if os.path.dirname(self.spill_path):
+            os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+        self.rows_spilled += len(rows)
+        logger.warning(f"Spilled {len(rows)} unsent sheet rows to {self.spill_path}")
+
+    def _load_spill(self):
+        if not os.path.exists(self.spill_path):
+            return []
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        os.remove(self.spill_path)
+        if rows:
+            logger.info(f"Re-queued {len(rows)} spilled sheet rows")
+        return rows
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_sheet_writer():
+    """The process-wide writer, started on first use and flushed at exit"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = SheetWriter()
+            _writer.start()
+            atexit.register(_writer.stop)
+        return _writer
+
+
+class SheetReader:
+    """Caches sheet rows and only fetches rows appended since the last read"""
+
+    def __init__(self, client_factory=default_client, sheet_name=SHEET_NAME, ttl=60.0):
+        self.client_factory = client_factory
+        self.sheet_name = sheet_name
+        self.ttl = ttl
+        self.header = None
+        self.rows = []
+        # Sheet row the next incremental read starts at; blank rows are not
+        # kept in rows, so this can run ahead of len(rows) + 2
+        self.next_row = 2
+        self.fetched_at = None
+        self._worksheet = None
+        self._lock = threading.Lock()
+
+    def _get_worksheet(self):
+        if self._worksheet is None:
+            self._worksheet = self.client_factory().open(self.sheet_name).sheet1
+        return self._worksheet
+
+    def _pad(self, row):
+        # The API drops trailing empty cells
+        return row[: len(self.header)] + [""] * (len(self.header) - len(row))
+
+    def fetch(self, force=False):
+        """Return (header, rows), hitting the API at most once per ttl"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.fetched_at is not None and now - self.fetched_at < self.ttl:
+                return self.header, self.rows
+
+            worksheet = self._get_worksheet()
+            if not self.header:
+                # First read, or the sheet had no header yet: read it all
+                values = worksheet.get_all_values()
+                self.header = values[0] if values else []
+                self.rows = [self._pad(row) for row in values[1:] if any(row)]
+                self.next_row = max(2, len(values) + 1)
+            else:
+                from gspread.utils import rowcol_to_a1
+
+                first = rowcol_to_a1(self.next_row, 1)
+                last_col = rowcol_to_a1(1, len(self.header)).rstrip("0123456789")
+                new_rows = worksheet.get_values(f"{first}:{last_col}")
+                self.rows.extend(self._pad(row) for row in new_rows if any(row))
+                self.next_row += len(new_rows)
+            self.fetched_at = now
+            return self.header, self.rows
@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import threading
+import time
+from bot.rollups import (
+    add_to_rollup, create_rollup_table, prune_rollup, query_rollup, rollup_counts, total_bucket,
+)
+
+DECISIONS_DB_PATH = "data/decisions.db"
+
+COLUMNS = [
+    "ts",
+    "post_id",
+    "name",
+    "content",
+    "score",
+    "prompt",
+    "decision",
+    "latency_ms",
+]
+
+RESOURCE_COLUMNS = [
+    "ts",
+    "session",
+    "outcome",
+    "duration_s",
+    "peak_rss_mb",
+    "avg_rss_mb",
+    "cpu_seconds",
+    "peak_procs",
+    "samples",
+]
+
+
+class DecisionStore:
+    """Append-only local record of every decision, kept in SQLite (WAL mode)"""
+
+    def __init__(self, path=DECISIONS_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " ts REAL NOT NULL,"
+            " post_id TEXT,"
+            " name TEXT,"
+            " content TEXT,"
+            " score REAL,"
+            " prompt TEXT,"
+            " decision TEXT NOT NULL,"
+            " latency_ms REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS decisions_ts ON decisions (ts)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS decisions_decision_ts ON decisions (decision, ts)"
+        )
+        # Chrome resource usage per bot session (see bot.resources)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_resources ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " ts REAL NOT NULL,"
+            " session TEXT,"
+            " outcome TEXT,"
+            " duration_s REAL,"
+            " peak_rss_mb REAL,"
+            " avg_rss_mb REAL,"
+            " cpu_seconds REAL,"
+            " peak_procs INTEGER,"
+            " samples INTEGER)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS session_resources_ts ON session_resources (ts)"
+        )
+        # Decision counts per minute/hour/day, kept in step with every insert
+        create_rollup_table(self.conn, "decision_rollup", "decision")
+        self.conn.commit()
+        self._backfill_rollup()
+
+    def _backfill_rollup(self):
+        """Build the rollup from decisions recorded before it existed"""
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM decision_rollup LIMIT 1").fetchone():
+                return
+            counts = {}
+            for ts, decision in self.conn.execute("SELECT ts, decision FROM decisions"):
+                for key, n in rollup_counts(ts, decision).items():
+                    counts[key] = counts.get(key, 0) + n
+            if counts:
+                add_to_rollup(self.conn, "decision_rollup", "decision", counts)
+                prune_rollup(self.conn, "decision_rollup")
+                self.conn.commit()
+
+    def record(self, decision, content="", name=None, post_id=None, score=None,
+               prompt=None, latency_ms=None, ts=None):
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO decisions (ts, post_id, name, content, score, prompt,"
+                " decision, latency_ms) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts, post_id, name, content, score, prompt, decision, latency_ms),
+            )
+            add_to_rollup(self.conn, "decision_rollup", "decision", rollup_counts(ts, decision))
+            prune_rollup(self.conn, "decision_rollup")
+            self.conn.commit()
+
+    def _where(self, since, until, decision):
+        clauses, params = [], []
+        if decision is not None:
+            clauses.append("decision = ?")
+            params.append(decision)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, since=None, until=None, decision=None, limit=None):
+        """Decisions in [since, until) as dicts, newest first"""
+        where, params = self._where(since, until, decision)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM decisions{where} ORDER BY ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def contents_after(self, last_id=0, limit=None):
+        """(id, content) of decisions with id > last_id, oldest first"""
+        sql = "SELECT id, content FROM decisions WHERE id > ? ORDER BY id"
+        params = [last_id]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def count(self, since=None, until=None, decision=None):
+        where, params = self._where(since, until, decision)
+        with self._lock:
+            return self.conn.execute(
+                f"SELECT COUNT(*) FROM decisions{where}", params
+            ).fetchone()[0]
+
+    def rollup(self, bucket, since=None, until=None, decision=None):
+        """(bucket start, decision, count) rows for "minute", "hour" or "day" buckets"""
+        with self._lock:
+            return query_rollup(self.conn, "decision_rollup", "decision", bucket, since, until, decision)
+
+    def rollup_total(self, since=None, decision=None):
+        """Decisions since `since` (whole buckets), summed from the rollup"""
+        rows = self.rollup(total_bucket(since), since=since, decision=decision)
+        return sum(row[2] for row in rows)
+
+    def record_session_resources(self, session, outcome, duration_s, peak_rss_mb, avg_rss_mb,
+                                 cpu_seconds, peak_procs, samples, ts=None):
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO session_resources (ts, session, outcome, duration_s, peak_rss_mb,"
+                " avg_rss_mb, cpu_seconds, peak_procs, samples) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts, session, outcome, duration_s, peak_rss_mb, avg_rss_mb, cpu_seconds,
+                 peak_procs, samples),
+            )
+            self.conn.commit()
+
+    def session_resources(self, since=None, limit=None):
+        """Per-session Chrome resource usage as dicts, newest first"""
+        sql = f"SELECT {', '.join(RESOURCE_COLUMNS)} FROM session_resources"
+        params = []
+        if since is not None:
+            sql += " WHERE ts >= ?"
+            params.append(since)
+        sql += " ORDER BY ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(zip(RESOURCE_COLUMNS, row)) for row in rows]
+
+    def version(self, table="decisions"):
+        """Id of the newest row in table; changes exactly when a row is added"""
+        if table not in ("decisions", "session_resources"):
+            raise ValueError(f"Unknown table {table}")
+        with self._lock:
+            return self.conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,199 @@
+"""
+Rescore the recorded decision history offline and sweep thresholds and prompts.
+
+Usage:
+    python -m bot.sweep                                   # current prompts, 0.05..0.95
+    python -m bot.sweep --prompt "..." --prompt "..."     # compare candidate prompts
+    python -m bot.sweep --thresholds 0.6,0.7,0.75 --output sweep.json
+
+The history is read in id-range chunks by a process pool; each worker opens
+its own read-only connection and returns only counts and a few example
+flips, so memory stays bounded however long the history is.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from bot.decision import SCORER_THRESHOLDS, SCORERS
+from bot.store import DECISIONS_DB_PATH
+
+CHUNK_SIZE = 5000
+MAX_FLIP_EXAMPLES = 20
+# Recorded decisions for which the bot went on to try connecting
+ATTEMPTED = ("Connected", "Connect Not Found")
+
+_scorer = None
+
+
+def _init_worker(scorer_name, model_path):
+    global _scorer
+    _scorer = SCORERS[scorer_name].load(model_path)
+
+
+def _read_chunk(db_path, lo, hi):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute(
+            "SELECT id, post_id, content, decision FROM decisions"
+            " WHERE id >= ? AND id < ? ORDER BY id",
+            (lo, hi),
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _sweep_chunk(args):
+    """Counts of shape (prompts, thresholds) for one id range, plus example flips"""
+    db_path, lo, hi, thresholds, max_examples = args
+    rows = _read_chunk(db_path, lo, hi)
+    thresholds = np.asarray(thresholds)
+    if not rows:
+        return {"rows": 0}
+
+    ids = np.array([row[0] for row in rows])
+    scores = np.asarray(_scorer.score_matrix([row[2] or "" for row in rows]))
+    was_attempted = np.array([row[3] in ATTEMPTED for row in rows])
+
+    # (posts, prompts, thresholds) in one comparison
+    selected = scores[:, :, None] >= thresholds[None, None, :]
+    flips_on = selected & ~was_attempted[:, None, None]
+    flips_off = ~selected & was_attempted[:, None, None]
+
+    examples = {}
+    for name, flips in (("on", flips_on), ("off", flips_off)):
+        for p, t in zip(*np.nonzero(flips.any(axis=0))):
+            hits = np.flatnonzero(flips[:, p, t])[:max_examples]
+            examples[(name, int(p), int(t))] = [
+                {"id": int(ids[i]), "post_id": rows[i][1], "score": round(float(scores[i, p]), 4),
+                 "content": (rows[i][2] or "")[:200]}
+                for i in hits
+            ]
+    return {
+        "rows": len(rows),
+        "attempted": int(was_attempted.sum()),
+        "selected": selected.sum(axis=0),
+        "flips_on": flips_on.sum(axis=0),
+        "flips_off": flips_off.sum(axis=0),
+        "examples": examples,
+    }
+
+
+def id_ranges(db_path, chunk_size=CHUNK_SIZE):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        lo, hi = conn.execute("SELECT MIN(id), MAX(id) FROM decisions").fetchone()
+    finally:
+        conn.close()
+    if lo is None:
+        return []
+    return [(start, start + chunk_size) for start in range(lo, hi + 1, chunk_size)]
+
+
+def sweep(prompts, thresholds, db_path=DECISIONS_DB_PATH, scorer="tfidf",
+          chunk_size=CHUNK_SIZE, workers=None, max_examples=MAX_FLIP_EXAMPLES):
+    """Rescore every recorded post against each prompt at each threshold"""
+    thresholds = sorted(float(t) for t in thresholds)
+    with tempfile.TemporaryDirectory(prefix="bot_sweep_") as model_dir:
+        model_path = model_dir if scorer == "tfidf" else os.path.join(model_dir, "model.json")
+        # Fit once here; workers only load (and, for TF-IDF, memory-map) the artifact.
+        # BM25 also catches up on the swept store, not the bot's default one
+        extra = {} if scorer == "tfidf" else {"store_path": db_path}
+        SCORERS[scorer].load_or_fit(prompts, path=model_path, **extra)
+
+        n_prompts, n_thresholds = len(prompts), len(thresholds)
+        totals = {
+            "rows": 0,
+            "attempted": 0,
+            "selected": np.zeros((n_prompts, n_thresholds), dtype=np.int64),
+            "flips_on": np.zeros((n_prompts, n_thresholds), dtype=np.int64),
+            "flips_off": np.zeros((n_prompts, n_thresholds), dtype=np.int64),
+        }
+        examples = {}
+        tasks = [(db_path, lo, hi, thresholds, max_examples) for lo, hi in id_ranges(db_path, chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                 initializer=_init_worker, initargs=(scorer, model_path)) as pool:
+            for part in pool.map(_sweep_chunk, tasks):
+                if not part["rows"]:
+                    continue
+                for key in totals:
+                    totals[key] += part[key]
+                for key, found in part["examples"].items():
+                    kept = examples.setdefault(key, [])
+                    kept.extend(found[:max_examples - len(kept)])
+
+    results = []
+    for p, prompt in enumerate(prompts):
+        for t, threshold in enumerate(thresholds):
+            results.append({
+                "prompt": prompt,
+                "threshold": threshold,
+                "selected": int(totals["selected"][p, t]),
+                "selected_rate": totals["selected"][p, t] / totals["rows"] if totals["rows"] else 0.0,
+                "flips_on": int(totals["flips_on"][p, t]),
+                "flips_off": int(totals["flips_off"][p, t]),
+                "flip_examples": {
+                    "on": examples.get(("on", p, t), []),
+                    "off": examples.get(("off", p, t), []),
+                },
+            })
+    return {"rows": totals["rows"], "attempted": totals["attempted"], "results": results}
+
+
+def parse_thresholds(text):
+    """'0.6,0.7' or 'start:stop:step' (stop inclusive)"""
+    if ":" in text:
+        start, stop, step = (float(x) for x in text.split(":"))
+        return list(np.round(np.arange(start, stop + step / 2, step), 4))
+    return [float(x) for x in text.split(",") if x]
+
+
+def main():
+    from bot.prompts import PROMPTS
+
+    parser = argparse.ArgumentParser(description="Rescore recorded posts across thresholds and prompts")
+    parser.add_argument("--store", default=DECISIONS_DB_PATH)
+    parser.add_argument("--prompt", action="append", help="candidate prompt (repeatable); default: current prompts")
+    parser.add_argument("--thresholds", default="0.05:0.95:0.05")
+    parser.add_argument("--scorer", default="tfidf", choices=list(SCORERS))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--examples", type=int, default=MAX_FLIP_EXAMPLES)
+    parser.add_argument("--output", help="write full results, with flip examples, as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.store):
+        print(f"❌ No decision store at {args.store}")
+        return 1
+    prompts = args.prompt or list(PROMPTS.values())
+    started = time.perf_counter()
+    report = sweep(prompts, parse_thresholds(args.thresholds), args.store, args.scorer,
+                   args.chunk_size, args.workers, args.examples)
+    elapsed = time.perf_counter() - started
+
+    print(f"📚 Rescored {report['rows']} posts ({report['attempted']} recorded connect attempts) "
+          f"in {elapsed:.1f}s")
+    for p, prompt in enumerate(prompts):
+        print(f"\n🎯 Prompt {p + 1}: {prompt[:90]}")
+        print(f"{'threshold':>9} {'selected':>9} {'rate':>7} {'new on':>8} {'new off':>8}")
+        for row in report["results"]:
+            if row["prompt"] != prompt:
+                continue
+            marker = "  ←" if abs(row["threshold"] - SCORER_THRESHOLDS[args.scorer]) < 1e-9 else ""
+            print(f"{row['threshold']:9.2f} {row['selected']:9} {row['selected_rate']:7.1%} "
+                  f"{row['flips_on']:8} {row['flips_off']:8}{marker}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nFull results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
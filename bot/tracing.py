@@ -0,0 +1,198 @@
+"""
+Per-session traces in Chrome trace-event format.
+
+Enabled with BOT_TRACE=1. Each bot session is written to
+data/traces/trace_<time>_<session>.json, which loads in ui.perfetto.dev or
+chrome://tracing. Spans nest by time on each thread: job > run_bot >
+phases and posts > helper calls. Old files are deleted once there are more
+than BOT_TRACE_MAX_FILES or they take more than BOT_TRACE_MAX_MB.
+
+When tracing is off, or no session is being traced, span() returns a shared
+no-op context manager, so instrumented code pays one global lookup.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+logger = logging.getLogger(__name__)
+
+TRACE_ENABLED = os.environ.get("BOT_TRACE", "0") == "1"
+TRACE_DIR = "data/traces"
+MAX_FILES = int(os.environ.get("BOT_TRACE_MAX_FILES", "20"))
+MAX_BYTES = float(os.environ.get("BOT_TRACE_MAX_MB", "50")) * 1024 * 1024
+# Stop recording spans past this many in one session, so a runaway loop
+# cannot grow one file without bound
+MAX_EVENTS = 100_000
+
+_NULL_SPAN = nullcontext()
+_trace = None
+
+
+class Trace:
+    """Trace events of one session, kept in memory until it ends"""
+
+    def __init__(self, session=None):
+        self.session = session
+        self.started = time.time()
+        self.pid = os.getpid()
+        self.events = []
+        self.dropped = 0
+        self._origin = time.perf_counter()
+
+    def now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def add(self, name, cat, start_us, dur_us, args):
+        if len(self.events) >= MAX_EVENTS:
+            self.dropped += 1
+            return
+        event = {"name": name, "cat": cat, "ph": "X", "ts": round(start_us, 1),
+                 "dur": round(dur_us, 1), "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def to_json(self):
+        threads = {e["tid"] for e in self.events}
+        meta = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                 "args": {"name": f"bot session {self.session or '?'}"}}]
+        meta += [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                  "args": {"name": "main" if tid == threading.main_thread().ident else f"thread {tid}"}}
+                 for tid in threads]
+        return {
+            "traceEvents": meta + self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"session": self.session, "started": self.started, "dropped": self.dropped},
+        }
+
+
+class Span:
+    __slots__ = ("trace", "name", "cat", "args", "start")
+
+    def __init__(self, trace, name, cat, args):
+        self.trace = trace
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.trace.now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.trace.add(self.name, self.cat, self.start, self.trace.now_us() - self.start, self.args)
+        return False
+
+
+def span(name, cat="bot", **args):
+    """Time a block as a span of the session being traced (no-op otherwise)"""
+    trace = _trace
+    if trace is None:
+        return _NULL_SPAN
+    return Span(trace, name, cat, args)
+
+
+def traced(name=None, cat="bot"):
+    """Decorator: run every call of the function inside a span"""
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = _trace
+            if trace is None:
+                return fn(*args, **kwargs)
+            with Span(trace, span_name, cat, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class _TraceSession:
+    """Start a trace unless one is already running; the outermost one writes it"""
+
+    def __init__(self, session):
+        self.session = session
+        self.owner = False
+
+    def __enter__(self):
+        global _trace
+        if _trace is None:
+            _trace = Trace(self.session)
+            self.owner = True
+        elif self.session and not _trace.session:
+            _trace.session = self.session
+        return _trace
+
+    def __exit__(self, exc_type, exc, tb):
+        global _trace
+        if self.owner:
+            trace, _trace = _trace, None
+            try:
+                write_trace(trace)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write trace: {e}")
+        return False
+
+
+def trace_session(session=None):
+    """Collect spans for one bot session into a trace file, if BOT_TRACE=1.
+
+    Nested calls join the running trace, so BotManager.job and run_bot can
+    both open one and the job's span ends up in the session's file.
+    """
+    if not TRACE_ENABLED:
+        return _NULL_SPAN
+    return _TraceSession(session)
+
+
+def write_trace(trace, trace_dir=TRACE_DIR):
+    os.makedirs(trace_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(trace.started))
+    path = os.path.join(trace_dir, f"trace_{stamp}_{trace.session or 'nosession'}.json")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(trace.to_json(), f, separators=(",", ":"))
+    os.replace(tmp, path)
+    logger.info(f"🧵 Trace written to {path} ({len(trace.events)} spans)",
+                extra={"event": "trace_written", "spans": len(trace.events)})
+    rotate_traces(trace_dir)
+    return path
+
+
+def recent_traces(trace_dir=TRACE_DIR, limit=None):
+    """(path, size, mtime) of the trace files, newest first"""
+    try:
+        names = [n for n in os.listdir(trace_dir) if n.startswith("trace_") and n.endswith(".json")]
+    except FileNotFoundError:
+        return []
+    files = []
+    for name in names:
+        path = os.path.join(trace_dir, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        files.append((path, st.st_size, st.st_mtime))
+    files.sort(key=lambda f: f[2], reverse=True)
+    return files[:limit] if limit else files
+
+
+def rotate_traces(trace_dir=TRACE_DIR, max_files=MAX_FILES, max_bytes=MAX_BYTES):
+    """Delete the oldest traces beyond max_files or max_bytes (the newest is always kept)"""
+    files = recent_traces(trace_dir)
+    total = 0
+    for i, (path, size, _) in enumerate(files):
+        total += size
+        if i > 0 and (i >= max_files or total > max_bytes):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
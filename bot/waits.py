@@ -0,0 +1,69 @@
+import logging
+import os
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from bot import metrics
+
+logger = logging.getLogger(__name__)
+
+PAGE_LOAD_TIMEOUT = float(os.environ.get("BOT_PAGE_LOAD_TIMEOUT", "30"))
+READY_TIMEOUT = float(os.environ.get("BOT_READY_TIMEOUT", "10"))
+FEED_TIMEOUT = float(os.environ.get("BOT_FEED_TIMEOUT", "15"))
+POLL_INTERVAL = 0.2
+
+AUTH_MARKERS = ("login", "checkpoint", "authwall")
+POST_CLASS = "feed-shared-update-v2"
+
+
+class AuthRedirect(Exception):
+    """The browser was sent to a login or checkpoint page"""
+
+    def __init__(self, url):
+        super().__init__(f"redirected to {url}")
+        self.url = url
+
+
+def is_auth_redirect(url):
+    return any(marker in url for marker in AUTH_MARKERS)
+
+
+def wait_until(driver, condition, timeout, name):
+    """WebDriverWait.until that records how long the wait took and how it ended"""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        outcome = "timeout"
+        raise
+    except AuthRedirect:
+        outcome = "auth_redirect"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.WAIT_SECONDS.observe(elapsed, wait=name, outcome=outcome)
+        logger.debug(f"⏱️ wait {name}: {outcome} after {elapsed:.2f}s")
+
+
+def wait_ready(driver, timeout=READY_TIMEOUT):
+    """Wait until the current document has finished loading"""
+    return wait_until(
+        driver,
+        lambda d: d.execute_script("return document.readyState") == "complete",
+        timeout,
+        "document_ready",
+    )
+
+
+def wait_for_feed(driver, timeout=FEED_TIMEOUT):
+    """Wait for feed posts to render; raises AuthRedirect as soon as a login page shows"""
+
+    def feed_posts(d):
+        url = d.current_url
+        if is_auth_redirect(url):
+            raise AuthRedirect(url)
+        return d.find_elements(By.CLASS_NAME, POST_CLASS) or False
+
+    return wait_until(driver, feed_posts, timeout, "feed_posts")
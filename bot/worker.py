@@ -0,0 +1,152 @@
+"""
+Bot worker process: runs scheduled and one-off bot sessions outside the
+dashboard and reports progress through the control channel (bot.control).
+
+Usage: python -m bot.worker  (the dashboard starts it on demand)
+"""
+
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from bot import metrics
+from bot.control import ControlChannel
+from bot.coordination import RunLock
+from bot.jsonlog import current_session, setup_logging
+from bot_manager import BotManager
+
+logger = logging.getLogger(__name__)
+
+WORKER_LOCK_PATH = "data/worker.lock"
+POLL_SECONDS = 0.5
+
+
+class ProgressHandler(logging.Handler):
+    """Turns run_bot's structured log events into status row updates"""
+
+    def __init__(self, channel):
+        super().__init__(level=logging.INFO)
+        self.channel = channel
+
+    def emit(self, record):
+        event = getattr(record, "event", None)
+        try:
+            if event == "session_start":
+                self.channel.update_status(session=current_session(), post=0, post_total=None)
+            elif event == "scored":
+                self.channel.update_status(post=0, post_total=record.posts)
+            elif event == "post_start":
+                self.channel.update_status(post=record.post, post_total=record.total)
+        except Exception:
+            self.handleError(record)
+
+
+class Worker:
+    def __init__(self, channel, manager):
+        self.channel = channel
+        self.manager = manager
+        self._run_thread = None
+        self._stop = threading.Event()
+
+    def busy(self):
+        return self._run_thread is not None and self._run_thread.is_alive()
+
+    def handle(self, command, args):
+        """Apply one dashboard command; returns (ok, result)"""
+        if command == "start":
+            ok = self.manager.start_scheduled_bot(args.get("interval_minutes"))
+            return ok, None if ok else "already running"
+        if command == "stop":
+            ok = self.manager.stop_scheduled_bot()
+            return ok, None if ok else "not running"
+        if command == "run_once":
+            if self.busy() or self.manager.active:
+                return False, "a run is already in progress"
+            self._run_thread = threading.Thread(
+                target=self.manager.run_once, name="bot-run-once", daemon=True
+            )
+            self._run_thread.start()
+            return True, None
+        if command == "shutdown":
+            self._stop.set()
+            return True, None
+        return False, f"unknown command {command}"
+
+    def publish(self):
+        """Copy the manager's state into the status row"""
+        manager = self.manager
+        next_run = manager.get_next_run_time()
+        self.channel.update_status(
+            heartbeat=time.time(),
+            state="running" if manager.active else "idle",
+            scheduled=int(manager.is_running),
+            interval_minutes=manager.interval_minutes,
+            next_run=next_run.timestamp() if next_run else None,
+            last_run=manager.last_run_time.timestamp() if manager.last_run_time else None,
+            run_count=manager.run_count,
+            error_count=manager.error_count,
+            last_error=manager.last_error,
+            phase=metrics.current_phase(),
+        )
+
+    def serve(self):
+        while not self._stop.is_set():
+            for cmd_id, command, args in self.channel.claim():
+                logger.info(f"📨 Worker command: {command}")
+                try:
+                    ok, result = self.handle(command, args)
+                except Exception as e:
+                    logger.error(f"Worker command {command} failed: {e}")
+                    ok, result = False, str(e)
+                self.channel.finish(cmd_id, ok, result)
+            self.publish()
+            self._stop.wait(POLL_SECONDS)
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    setup_logging()
+    lock = RunLock(WORKER_LOCK_PATH)
+    if not lock.acquire():
+        logger.warning("Another bot worker is already running, exiting")
+        return 1
+
+    channel = ControlChannel()
+    manager = BotManager()
+    # Counters survive worker restarts through the status row
+    previous = channel.status()
+    manager.run_count = previous["run_count"] or 0
+    manager.error_count = previous["error_count"] or 0
+    if previous["last_run"]:
+        manager.last_run_time = datetime.fromtimestamp(previous["last_run"])
+    # A schedule the last worker left in the job store carries on
+    manager.resume_scheduled_bot(previous["interval_minutes"])
+
+    worker = Worker(channel, manager)
+    logging.getLogger().addHandler(ProgressHandler(channel))
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    channel.update_status(pid=os.getpid(), heartbeat=time.time(), state="idle", phase=None)
+    logger.info(f"🧵 Bot worker {os.getpid()} ready")
+    try:
+        worker.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if manager.is_running:
+            # Keep the persisted job: a restarted worker resumes it
+            manager.stop_scheduled_bot(clear_schedule=False)
+        elif manager.driver_manager is not None:
+            manager.driver_manager.close()
+        channel.update_status(state="stopped", phase=None, heartbeat=None)
+        channel.close()
+        lock.release()
+        logger.info("🧵 Bot worker stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
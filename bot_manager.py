@@ -1,32 +1,72 @@
+import os
+import subprocess
+import sys
 import threading
 import time
 import logging
 import random
 from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from bot.scraper import run_bot
+from bot.control import ControlChannel
+from bot.coordination import RunCoordinator, RunLock, build_scheduler, persisted_next_run
+from bot import metrics
+from bot.tracing import span, trace_session
 
 logger = logging.getLogger(__name__)
 
 class BotManager:
     def __init__(self):
         self.scheduler = None
+        self.coordinator = None
         self.is_running = False
         self.last_run_time = None
         self.run_count = 0
         self.error_count = 0
+        self.last_error = None
+        self.interval_minutes = None
+        # True while a bot session is in progress
+        self.active = False
+        # Chrome session kept warm between scheduled runs; created on the
+        # first run so importing the dashboard does not load selenium
+        self.driver_manager = None
         
     def job(self):
         """Job function that runs the bot"""
+        with RunLock() as acquired:
+            if not acquired:
+                logger.warning("⏭️ Another bot session is running, skipping this run")
+                return
+            # The job span joins the session's trace that run_bot opens inside it
+            with trace_session(), span("job"):
+                self._run()
+
+    def _run(self):
+        from bot.browser import DriverManager
+        from bot.scraper import run_bot
+
+        if self.driver_manager is None:
+            self.driver_manager = DriverManager()
         logger.info("Starting bot execution...")
         self.last_run_time = datetime.now()
+        self.active = True
+        started = time.perf_counter()
+        status = "ok"
         try:
-            run_bot()
+            run_bot(self.driver_manager)
             logger.info("Bot execution completed successfully")
             self.run_count += 1
         except Exception as e:
             logger.error(f"Bot execution failed: {e}")
             self.error_count += 1
+            self.last_error = str(e)
+            status = "error"
+        finally:
+            self.active = False
+            metrics.JOB_SECONDS.observe(time.perf_counter() - started, status=status)
+            metrics.JOBS.inc(status=status)
+            try:
+                metrics.REGISTRY.write()
+            except OSError as e:
+                logger.warning(f"Could not write metrics: {e}")
     
     def start_scheduled_bot(self, interval_minutes=None):
         """Start the scheduled bot"""
@@ -35,14 +75,17 @@ class BotManager:
             return False
         
         try:
-            self.scheduler = BackgroundScheduler()
+            from apscheduler.schedulers.background import BackgroundScheduler
+
+            self.scheduler = build_scheduler(BackgroundScheduler, "dashboard")
             
             # Use provided interval or random between 1-10 minutes
             delay = interval_minutes if interval_minutes else random.randint(1, 10)
             
-            self.scheduler.add_job(self.job, "interval", minutes=delay)
-            self.scheduler.start()
+            self.coordinator = RunCoordinator(self.scheduler, self.job, delay)
+            self.coordinator.start()
             self.is_running = True
+            self.interval_minutes = delay
             
             logger.info(f"Bot scheduler started with {delay} minute interval")
             return True
@@ -50,16 +93,29 @@ class BotManager:
             logger.error(f"Failed to start bot scheduler: {e}")
             return False
     
-    def stop_scheduled_bot(self):
-        """Stop the scheduled bot"""
+    def resume_scheduled_bot(self, interval_minutes=None):
+        """Start the scheduler again if an earlier process left its schedule persisted"""
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        if self.is_running or persisted_next_run(BackgroundScheduler, "dashboard") is None:
+            return False
+        logger.info("Resuming the persisted bot schedule")
+        return self.start_scheduled_bot(interval_minutes)
+
+    def stop_scheduled_bot(self, clear_schedule=True):
+        """Stop the scheduled bot; with clear_schedule=False the persisted job
+        is kept, so the next process resumes it"""
         if not self.is_running or not self.scheduler:
             logger.warning("Bot scheduler is not running")
             return False
         
         try:
-            self.scheduler.shutdown()
+            self.coordinator.stop(clear_schedule=clear_schedule)
+            self.coordinator = None
             self.scheduler = None
             self.is_running = False
+            if self.driver_manager is not None:
+                self.driver_manager.close()
             logger.info("Bot scheduler stopped")
             return True
         except Exception as e:
@@ -88,11 +144,102 @@ class BotManager:
     
     def get_next_run_time(self):
         """Get the next scheduled run time"""
-        if self.scheduler and self.is_running:
-            jobs = self.scheduler.get_jobs()
-            if jobs:
-                return jobs[0].next_run_time
+        if self.coordinator and self.is_running:
+            return self.coordinator.next_run_time()
+        return None
+
+
+# Seconds to wait for a freshly spawned worker to report in
+WORKER_START_TIMEOUT = 10
+
+
+class WorkerClient:
+    """Dashboard-side handle on the bot worker process (python -m bot.worker).
+
+    Commands are queued in the control channel and return immediately; status
+    comes from the worker's status row, so reading it never blocks on a run.
+    """
+
+    def __init__(self, channel=None):
+        self._channel = channel
+
+    @property
+    def channel(self):
+        if self._channel is None:
+            self._channel = ControlChannel()
+        return self._channel
+
+    def ensure_worker(self):
+        """Start the worker process unless one is already reporting in"""
+        if self.channel.worker_alive():
+            return True
+        logger.info("🚀 Starting bot worker process")
+        subprocess.Popen(
+            [sys.executable, "-m", "bot.worker"],
+            cwd=os.getcwd(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.time() + WORKER_START_TIMEOUT
+        while time.time() < deadline:
+            if self.channel.worker_alive():
+                return True
+            time.sleep(0.2)
+        logger.error("Bot worker did not start")
+        return False
+
+    def _send(self, command, **args):
+        if not self.ensure_worker():
+            return None
+        return self.channel.send(command, **args)
+
+    def start_scheduled_bot(self, interval_minutes=None):
+        if self.get_status()["is_running"]:
+            return False
+        return self._send("start", interval_minutes=interval_minutes) is not None
+
+    def stop_scheduled_bot(self):
+        if not self.get_status()["is_running"]:
+            return False
+        return self._send("stop") is not None
+
+    def run_once(self):
+        """Queue a single run; returns as soon as the worker has the command"""
+        if self.get_status()["active"]:
+            return False
+        return self._send("run_once") is not None
+
+    def shutdown_worker(self):
+        if self.channel.worker_alive():
+            self.channel.send("shutdown")
+
+    def get_status(self):
+        status = self.channel.status()
+        alive = self.channel.worker_alive(status)
+        return {
+            'worker_alive': alive,
+            'worker_pid': status['pid'] if alive else None,
+            'is_running': alive and bool(status['scheduled']),
+            'active': alive and status['state'] == 'running',
+            'last_run_time': datetime.fromtimestamp(status['last_run']) if status['last_run'] else None,
+            'run_count': status['run_count'] or 0,
+            'error_count': status['error_count'] or 0,
+            'last_error': status['last_error'],
+            'interval_minutes': status['interval_minutes'],
+            'session': status['session'],
+            'phase': status['phase'] if alive else None,
+            'post': status['post'],
+            'post_total': status['post_total'],
+            'scheduler_active': alive and bool(status['scheduled']),
+        }
+
+    def get_next_run_time(self):
+        status = self.channel.status()
+        if status['next_run'] and status['scheduled'] and self.channel.worker_alive(status):
+            return datetime.fromtimestamp(status['next_run'])
         return None
 
-# Global bot manager instance
-bot_manager = BotManager() 
\ No newline at end of file
+# Dashboard handle on the out-of-process bot worker
+bot_worker = WorkerClient()
@@ -79,6 +79,22 @@ def run_bot(c):
     c.run("python3 -c 'from bot.scraper import run_bot; run_bot()'")
 
 
+@task
+def fit_scorer(c):
+    """Refit the post scorer on the prompts and config/corpus.txt"""
+    print("🧠 Fitting post scorer...")
+    c.run("rm -rf config/scorer")
+    c.run("python3 -c 'from bot.prompts import PROMPTS; from bot.probability_model import PostScorer; PostScorer.load_or_fit(list(PROMPTS.values()))'")
+    print("✅ Scorer saved to config/scorer")
+
+
+@task
+def sweep(c, thresholds="0.05:0.95:0.05"):
+    """Rescore the recorded decisions across a threshold sweep (all cores)"""
+    print("📚 Rescoring decision history...")
+    c.run(f"python3 -m bot.sweep --thresholds {thresholds} --output data/sweep.json")
+
+
 # GitHub Deployment Tasks
 @task
 def github_update(c):
@@ -1,33 +1,63 @@
+import os
 import random
+import signal
 import time
 import logging
 from apscheduler.schedulers.blocking import BlockingScheduler
+from bot.jsonlog import setup_logging
+from bot import metrics
+from bot.browser import DriverManager
+from bot.coordination import RunCoordinator, RunLock, build_scheduler
 from bot.scraper import run_bot
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot_logs.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging (BOT_LOG_FORMAT=json writes bot_logs.jsonl instead of bot_logs.log)
+LOG_FILE = setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# Chrome session kept warm between scheduled runs
+driver_manager = DriverManager()
+
 def job():
+    with RunLock() as acquired:
+        if not acquired:
+            logger.warning("⏭️ Another bot session is running, skipping this run")
+            return
+        run_job()
+
+def run_job():
     logger.info("Starting bot execution...")
+    started = time.perf_counter()
+    status = "ok"
     try:
-        run_bot()
+        run_bot(driver_manager)
         logger.info("Bot execution completed successfully")
     except Exception as e:
         logger.error(f"Bot execution failed: {e}")
+        status = "error"
+    finally:
+        metrics.JOB_SECONDS.observe(time.perf_counter() - started, status=status)
+        metrics.JOBS.inc(status=status)
+        metrics.REGISTRY.write()
+
+def handle_sigterm(signum, frame):
+    # systemctl stop / docker stop send SIGTERM; exit normally so the finally
+    # below and atexit handlers (the sheet writer's flush and spill) run
+    raise SystemExit(0)
+
+signal.signal(signal.SIGTERM, handle_sigterm)
 
 logger.info("Initializing LinkedIn automation bot...")
-scheduler = BlockingScheduler()
+# BOT_METRICS_PORT=9108 serves Prometheus metrics at http://127.0.0.1:9108/metrics
+if os.environ.get('BOT_METRICS_PORT'):
+    metrics.start_http_server(int(os.environ['BOT_METRICS_PORT']))
+# Schedule lives in data/jobs_main.sqlite, so a restart keeps the next run time
+scheduler = build_scheduler(BlockingScheduler, "main")
 delay = random.randint(1, 10)
-scheduler.add_job(job, "interval", minutes=delay)
+coordinator = RunCoordinator(scheduler, job, delay)
 logger.info(f"Scheduled job every {delay} minutes")
 logger.info("Bot scheduler started. Press Ctrl+C to stop.")
-scheduler.start()
+try:
+    coordinator.start()
+finally:
+    driver_manager.close()
@@ -1,21 +1,19 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
-import subprocess
-import time
 import logging
 import json
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import threading
-import signal
 import sys
-from bot.scraper import run_bot
-from bot.decision import DecisionEngine
-from bot_manager import bot_manager
+from bot_manager import bot_worker
+from bot.store import DecisionStore, DECISIONS_DB_PATH
+from bot.rollups import LogRollup, ROLLUP_DB_PATH, total_bucket
+from bot.auth import COOKIES_PATH, last_auth_result
+from bot.tracing import TRACE_ENABLED, recent_traces
+from bot.prompts import PROMPTS, THRESHOLDS
+from bot.logtail import LogTailer, tail_lines
+from bot.sheets import SheetReader
+from bot.metrics import METRICS_PATH, parse_prometheus
 
 # Configure page
 st.set_page_config(
@@ -25,105 +23,486 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def read_log_file(log_file_path="bot_logs.log", max_lines=1000):
-    """Read and parse log file"""
+LOG_TAIL_LINES = 1000
+REFRESH_SECONDS = 30
+LOG_COLUMNS = ['timestamp', 'level', 'message', 'raw']
+
+def default_log_file():
+    """Structured JSON-lines log if the bot writes one, else the text log"""
+    return "bot_logs.jsonl" if os.path.exists("bot_logs.jsonl") else "bot_logs.log"
+
+def parse_log_lines(lines):
+    """Parse 'timestamp - level - message' lines column-wise in one pass"""
+    if not lines:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    raw = pd.Series(lines, dtype=object)
+    parts = pd.DataFrame([line.split(' - ', 2) for line in lines], columns=range(3))
+    timestamp = pd.to_datetime(parts[0], format='%Y-%m-%d %H:%M:%S,%f', errors='coerce')
+    parsed = timestamp.notna() & parts[2].notna()
+    return pd.DataFrame({
+        # Continuation lines (e.g. tracebacks) take the time of the record above them
+        'timestamp': timestamp.where(parsed).ffill(),
+        'level': parts[1].where(parsed, 'UNKNOWN'),
+        'message': parts[2].where(parsed, raw),
+        'raw': raw,
+    })
+
+JSON_LOG_COLUMNS = ['ts', 'level', 'message', 'event', 'session', 'post']
+
+def _json_log_record(line):
+    try:
+        entry = json.loads(line)
+        return (entry['ts'], entry['level'], entry['msg'],
+                entry.get('event'), entry.get('session'), entry.get('post'))
+    except (ValueError, TypeError, KeyError):
+        return None
+
+def _read_json_records(lines):
+    """Records parsed by pyarrow's JSON reader, or None if any line is not
+    exactly one record with the expected types"""
+    import io
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+
+    schema = pa.schema([('ts', pa.float64()), ('level', pa.string()), ('msg', pa.string()),
+                        ('event', pa.string()), ('session', pa.string()), ('post', pa.int64())])
+    options = pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior='ignore')
+    try:
+        table = pa_json.read_json(io.BytesIO('\n'.join(lines).encode('utf-8')), parse_options=options)
+    except (pa.ArrowInvalid, UnicodeEncodeError):
+        return None
+    # More rows than lines means two records ran together on one line
+    if table.num_rows != len(lines) or any(table[c].null_count for c in ('ts', 'level', 'msg')):
+        return None
+    micros = pc.cast(pc.multiply(table['ts'], 1e6), pa.int64(), safe=False)
+    table = table.set_column(0, 'timestamp', pc.cast(micros, pa.timestamp('us')))
+    df = table.rename_columns(['timestamp', 'level', 'message', 'event', 'session', 'post']).to_pandas()
+    df['timestamp'] = df['timestamp'].astype('datetime64[ns]') + datetime.now().astimezone().utcoffset()
+    return df
+
+def parse_json_log_lines(lines):
+    """Parse JSON-lines records (see bot.jsonlog). A line that is not one
+    complete record (truncated, or interleaved with another writer) is kept
+    with level UNKNOWN and the time of the record above it, like the text
+    parser keeps lines it cannot split."""
+    if not lines:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    df = _read_json_records(lines)
+    if df is None:
+        df = _parse_json_lines_tolerant(lines)
+    df['raw'] = lines
+    return df
+
+def _parse_json_lines_tolerant(lines):
+    complete = [line[:1] == '{' and line[-1:] == '}' for line in lines]
+    good = [line for line, ok in zip(lines, complete) if ok]
+    records = _read_json_records(good) if good else None
+    if records is None:
+        # Slowest path: one json.loads per line
+        parsed = [_json_log_record(line) if ok else None for line, ok in zip(lines, complete)]
+        complete = [record is not None for record in parsed]
+        records = pd.DataFrame.from_records([r for r in parsed if r is not None], columns=JSON_LOG_COLUMNS)
+        records['timestamp'] = epoch_to_local(pd.to_numeric(records.pop('ts')))
+    records.index = [i for i, ok in enumerate(complete) if ok]
+    df = records.reindex(range(len(lines)))
+    bad = ~pd.Series(complete)
+    df.loc[bad, 'level'] = 'UNKNOWN'
+    df.loc[bad, 'message'] = pd.Series(lines)[bad]
+    df['timestamp'] = df['timestamp'].ffill()
+    return df
+
+@st.cache_resource
+def _versioned_cache():
+    return {}
+
+def cached_by_version(key, version, compute):
+    """Shared by every session: compute() runs again only when version changes,
+    so open tabs polling unchanged data cost a version check each"""
+    cache = _versioned_cache()
+    entry = cache.get(key)
+    if entry is None or entry[0] != version:
+        entry = (version, compute())
+        cache[key] = entry
+    return entry[1]
+
+def minute_floor(moment):
+    """Bucket 'now'-relative bounds so consecutive refreshes share cache entries"""
+    return moment.replace(second=0, microsecond=0) if moment else None
+
+@st.cache_resource
+def get_log_tailer(log_file_path):
+    """One tailer per log file, shared by every session and rerun"""
+    return LogTailer(log_file_path, max_lines=LOG_TAIL_LINES)
+
+@st.cache_resource
+def _parsed_log_cache():
+    return {}
+
+def read_log_file(log_file_path=None, max_lines=1000):
+    """Read and parse the last max_lines of the log file"""
+    log_file_path = log_file_path or default_log_file()
+    parse = parse_json_log_lines if log_file_path.endswith('.jsonl') else parse_log_lines
     try:
         if not os.path.exists(log_file_path):
-            return pd.DataFrame(columns=['timestamp', 'level', 'message'])
+            return pd.DataFrame(columns=LOG_COLUMNS)
         
-        logs = []
-        with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-            # Get last max_lines
-            lines = lines[-max_lines:] if len(lines) > max_lines else lines
-            
-            for line in lines:
-                line = line.strip()
-                if line:
-                    try:
-                        # Parse log format: timestamp - level - message
-                        parts = line.split(' - ', 2)
-                        if len(parts) >= 3:
-                            timestamp_str = parts[0]
-                            level = parts[1]
-                            message = parts[2]
-                            
-                            # Parse timestamp
-                            timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-                            
-                            logs.append({
-                                'timestamp': timestamp,
-                                'level': level,
-                                'message': message,
-                                'raw': line
-                            })
-                    except Exception as e:
-                        # If parsing fails, add as raw message
-                        logs.append({
-                            'timestamp': datetime.now(),
-                            'level': 'UNKNOWN',
-                            'message': line,
-                            'raw': line
-                        })
+        if max_lines > LOG_TAIL_LINES:
+            return parse(tail_lines(log_file_path, max_lines))
         
-        return pd.DataFrame(logs)
+        # Re-parse only when the tailer has moved since the last render
+        tailer = get_log_tailer(log_file_path)
+        lines = tailer.read()
+        cache = _parsed_log_cache()
+        key = (log_file_path, tailer.inode, tailer.offset)
+        if cache.get(log_file_path, (None, None))[0] != key:
+            cache[log_file_path] = (key, parse(lines))
+        return cache[log_file_path][1].tail(max_lines)
     except Exception as e:
         st.error(f"Error reading log file: {e}")
-        return pd.DataFrame(columns=['timestamp', 'level', 'message', 'raw'])
+        return pd.DataFrame(columns=LOG_COLUMNS)
+
+@st.cache_resource
+def get_sheet_reader():
+    """One incremental sheet reader shared by every session and rerun"""
+    return SheetReader(ttl=60)
+
+@st.cache_resource
+def _sheet_frame_cache():
+    return {'rows': 0, 'df': None}
 
 def get_posts_from_sheets():
-    """Get posts data from Google Sheets"""
+    """Get posts data from Google Sheets, fetching only newly appended rows"""
     try:
-        scope = [
-            "https://spreadsheets.google.com/feeds",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        
         if not os.path.exists("config/credentials.json"):
             return pd.DataFrame(columns=['timestamp', 'name', 'content', 'decision'])
         
-        creds = ServiceAccountCredentials.from_json_keyfile_name(
-            "config/credentials.json", scope
-        )
-        client = gspread.authorize(creds)
-        sheet = client.open("LinkedIn Auto Connect").sheet1
-        
-        # Get all records
-        records = sheet.get_all_records()
-        df = pd.DataFrame(records)
+        header, rows = get_sheet_reader().fetch()
+        cache = _sheet_frame_cache()
+        if cache['df'] is None or len(rows) < cache['rows']:
+            cache['df'], cache['rows'] = pd.DataFrame(columns=header), 0
         
-        if not df.empty and 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if len(rows) > cache['rows']:
+            new_df = pd.DataFrame(rows[cache['rows']:], columns=header)
+            if 'timestamp' in new_df.columns:
+                new_df['timestamp'] = pd.to_datetime(new_df['timestamp'])
+            df = new_df if cache['df'].empty else pd.concat([cache['df'], new_df], ignore_index=True)
+            cache['df'], cache['rows'] = df, len(rows)
         
-        return df
+        return cache['df']
     except Exception as e:
         st.warning(f"Could not connect to Google Sheets: {e}")
         return pd.DataFrame(columns=['timestamp', 'name', 'content', 'decision'])
 
-# Main dashboard
-def main():
-    st.title("🤖 LinkedIn Bot Dashboard")
-    st.markdown("Monitor and control your LinkedIn automation bot")
+PHASE_COLUMNS = ['phase', 'count', 'total_seconds', 'avg_seconds']
+
+def read_phase_metrics(metrics_path=METRICS_PATH):
+    """Per-phase run_bot timings, re-read only when the metrics file changes"""
+    if not os.path.exists(metrics_path):
+        return pd.DataFrame(columns=PHASE_COLUMNS)
+    return cached_by_version(('phases', metrics_path), os.stat(metrics_path).st_mtime_ns,
+                             lambda: parse_phase_metrics(metrics_path))
+
+def parse_phase_metrics(metrics_path):
+    """Per-phase run_bot timings from the bot's Prometheus metrics file"""
+    columns = PHASE_COLUMNS
+    with open(metrics_path, 'r', encoding='utf-8') as f:
+        samples = parse_prometheus(f.read())
     
-    # Get bot status
-    bot_status = bot_manager.get_status()
-    next_run = bot_manager.get_next_run_time()
+    phases = {}
+    for name, labels, value in samples:
+        if name == 'bot_phase_seconds_sum':
+            phases.setdefault(labels['phase'], {})['total_seconds'] = value
+        elif name == 'bot_phase_seconds_count':
+            phases.setdefault(labels['phase'], {})['count'] = value
     
-    # Sidebar controls
-    st.sidebar.header("🎛️ Bot Controls")
+    df = pd.DataFrame([{'phase': p, **v} for p, v in phases.items()], columns=columns[:3])
+    df['avg_seconds'] = df['total_seconds'] / df['count']
+    return df.sort_values('total_seconds', ascending=False)
+
+def epoch_to_local(seconds):
+    """Convert epoch seconds to naive local datetimes, matching datetime.now()"""
+    return pd.to_datetime(seconds, unit='s') + datetime.now().astimezone().utcoffset()
+
+@st.cache_resource
+def _open_decision_store():
+    return DecisionStore()
+
+def get_decision_store():
+    """The shared local decision store, or None if the bot has not written one yet"""
+    if not os.path.exists(DECISIONS_DB_PATH):
+        return None
+    return _open_decision_store()
+
+POST_COLUMNS = ['timestamp', 'name', 'content', 'decision', 'score', 'prompt', 'latency_ms']
+
+def get_posts_from_store(since=None):
+    """Get posts data from the local decision store, re-queried only after new decisions"""
+    store = get_decision_store()
+    if store is None:
+        return pd.DataFrame(columns=POST_COLUMNS)
+    since = minute_floor(since)
+    return cached_by_version(('posts', since), store.version(),
+                             lambda: load_posts(store, since))
+
+def load_posts(store, since=None):
+    records = store.query(since=since.timestamp() if since else None)
+    df = pd.DataFrame.from_records(records)
+    if df.empty:
+        return pd.DataFrame(columns=POST_COLUMNS)
+    df['timestamp'] = epoch_to_local(df.pop('ts'))
+    return df[POST_COLUMNS]
+
+def count_decisions(since=None, decision=None):
+    """Decision counts from the store's rollup, cached until the next decision is written"""
+    store = get_decision_store()
+    since = minute_floor(since)
+    return cached_by_version(
+        ('count', since, decision), store.version(),
+        lambda: store.rollup_total(since=since.timestamp() if since else None, decision=decision),
+    )
+
+def rollup_frame(rows, label):
+    df = pd.DataFrame(rows, columns=['start', label, 'count'])
+    df['timestamp'] = epoch_to_local(df.pop('start'))
+    return df
+
+def get_decision_rollup(bucket, since=None):
+    """Decisions per bucket and decision, read from the rollup rather than the raw rows"""
+    store = get_decision_store()
+    since = minute_floor(since)
+    return cached_by_version(
+        ('decision_rollup', bucket, since), store.version(),
+        lambda: rollup_frame(store.rollup(bucket, since=since.timestamp() if since else None), 'decision'),
+    )
+
+@st.cache_resource
+def _open_log_rollup():
+    return LogRollup()
+
+def get_log_rollup():
+    """Log counts the bot keeps per minute/hour/day, or None if it has not written any"""
+    if not os.path.exists(ROLLUP_DB_PATH):
+        return None
+    return _open_log_rollup()
+
+def get_log_counts(bucket, since=None):
+    rollup = get_log_rollup()
+    since = minute_floor(since)
+    return cached_by_version(
+        ('log_rollup', bucket, since), rollup.version(),
+        lambda: rollup_frame(rollup.query(bucket, since=since.timestamp() if since else None), 'level'),
+    )
+
+RESOURCE_SESSIONS = 200
+
+def get_session_resources(limit=RESOURCE_SESSIONS):
+    """Chrome usage of the most recent sessions, oldest first for charting"""
+    store = get_decision_store()
+    if store is None:
+        return pd.DataFrame()
+    
+    def load():
+        df = pd.DataFrame.from_records(store.session_resources(limit=limit))
+        if df.empty:
+            return df
+        df['timestamp'] = epoch_to_local(df.pop('ts'))
+        return df.iloc[::-1].reset_index(drop=True)
+    
+    return cached_by_version(('resources', limit), store.version('session_resources'), load)
+
+def get_posts(since=None):
+    """Posts from the local store, falling back to Google Sheets"""
+    df = get_posts_from_store(since)
+    if df.empty:
+        df = get_posts_from_sheets()
+        if since is not None and not df.empty and 'timestamp' in df.columns:
+            df = df[df['timestamp'] >= since]
+    return df
+
+def sidebar_status():
+    """Live bot status; a fragment, so the auto-refresh timer only redraws this panel"""
+    # Status comes from the bot worker's status row; reading it never waits on a run
+    bot_status = bot_worker.get_status()
+    next_run = bot_worker.get_next_run_time()
     
-    # Status display
     status_emoji = "🟢 Running" if bot_status['is_running'] else "🔴 Stopped"
-    st.sidebar.markdown(f"**Status:** {status_emoji}")
+    st.markdown(f"**Status:** {status_emoji}")
+    
+    if bot_status['active']:
+        progress = f"post {bot_status['post']}/{bot_status['post_total']}" if bot_status['post_total'] else "starting"
+        st.markdown(f"**Current Run:** {progress} ({bot_status['phase'] or 'between phases'})")
+    elif not bot_status['worker_alive']:
+        st.caption("Bot worker not running; it starts on the first command.")
     
     if bot_status['last_run_time']:
-        st.sidebar.markdown(f"**Last Run:** {bot_status['last_run_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+        st.markdown(f"**Last Run:** {bot_status['last_run_time'].strftime('%Y-%m-%d %H:%M:%S')}")
     
     if next_run:
-        st.sidebar.markdown(f"**Next Run:** {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+        st.markdown(f"**Next Run:** {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    st.markdown(f"**Total Runs:** {bot_status['run_count']}")
+    st.markdown(f"**Errors:** {bot_status['error_count']}")
+    
+    # Why sessions are being skipped, if the last login check failed
+    auth = last_auth_result()
+    if auth:
+        checked = datetime.fromtimestamp(auth['checked_at']).strftime('%Y-%m-%d %H:%M')
+        if auth['ok']:
+            expires = auth.get('expires_at')
+            until = f", cookie valid until {datetime.fromtimestamp(expires).strftime('%Y-%m-%d')}" if expires else ""
+            st.markdown(f"**Auth:** ✅ OK ({checked}{until})")
+        else:
+            st.markdown(f"**Auth:** 🔒 {auth['reason']} ({checked})")
+            st.caption(auth['message'])
+
+def overview_panel():
+    """Overview metrics and charts; a fragment refreshed on the auto-refresh timer"""
+    import plotly.express as px
+    
+    bot_status = bot_worker.get_status()
+    
+    # Metrics row
+    col1, col2, col3, col4 = st.columns(4)
+    
+    # Log counts come from the bot's rollup; older bots only have the raw log
+    log_rollup = get_log_rollup()
+    logs_df = read_log_file(max_lines=100) if log_rollup is None else None
+    store = get_decision_store()
+    day_ago = datetime.now() - timedelta(days=1)
+    posts_df = get_posts_from_sheets() if store is None else None
     
-    st.sidebar.markdown(f"**Total Runs:** {bot_status['run_count']}")
-    st.sidebar.markdown(f"**Errors:** {bot_status['error_count']}")
+    with col1:
+        st.metric("Bot Status", "Running" if bot_status['is_running'] else "Stopped")
+    
+    with col2:
+        if log_rollup is not None:
+            recent_logs = int(get_log_counts(total_bucket(day_ago.timestamp()), since=day_ago)['count'].sum())
+        else:
+            recent_logs = len(logs_df[logs_df['timestamp'] > day_ago]) if not logs_df.empty else 0
+        st.metric("Log Entries (24h)", recent_logs)
+    
+    with col3:
+        if store is not None:
+            connected_today = count_decisions(since=day_ago, decision='Connected')
+        elif not posts_df.empty:
+            connected_today = len(posts_df[
+                (posts_df['decision'] == 'Connected') & 
+                (posts_df['timestamp'] > day_ago)
+            ]) if 'timestamp' in posts_df.columns else 0
+        else:
+            connected_today = 0
+        st.metric("Connections Today", connected_today)
+    
+    with col4:
+        if store is not None:
+            total_posts = count_decisions()
+        elif not posts_df.empty:
+            total_posts = len(posts_df)
+        else:
+            total_posts = 0
+        st.metric("Total Posts Processed", total_posts)
+    
+    # Bot performance metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Bot Runs", bot_status['run_count'])
+    with col2:
+        st.metric("Bot Errors", bot_status['error_count'])
+    with col3:
+        success_rate = ((bot_status['run_count'] - bot_status['error_count']) / bot_status['run_count'] * 100) if bot_status['run_count'] > 0 else 0
+        st.metric("Success Rate", f"{success_rate:.1f}%")
+    
+    # Recent activity chart
+    if log_rollup is not None:
+        hourly_logs = get_log_counts('hour', since=day_ago).rename(columns={'timestamp': 'hour'})
+    elif not logs_df.empty:
+        # Group logs by hour
+        logs_df['hour'] = logs_df['timestamp'].dt.floor('h')
+        hourly_logs = logs_df.groupby(['hour', 'level']).size().reset_index(name='count')
+    else:
+        hourly_logs = pd.DataFrame()
+    
+    if not hourly_logs.empty:
+        st.subheader("📈 Recent Activity")
+        
+        fig = px.bar(hourly_logs, x='hour', y='count', color='level',
+                    title="Log Activity by Hour",
+                    color_discrete_map={
+                        'INFO': '#2E8B57',
+                        'WARNING': '#FF8C00',
+                        'ERROR': '#DC143C'
+                    })
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Where session time goes
+    phases_df = read_phase_metrics()
+    if not phases_df.empty:
+        st.subheader("⏱️ Session Phases")
+        fig = px.bar(phases_df, x='phase', y='total_seconds',
+                    hover_data=['count', 'avg_seconds'],
+                    title="Time Spent per Phase (since bot start)")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # What Chrome actually uses per session
+    resources_df = get_session_resources()
+    if not resources_df.empty:
+        st.subheader("🧠 Chrome Resources per Session")
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = px.line(resources_df, x='timestamp', y=['peak_rss_mb', 'avg_rss_mb'],
+                         markers=True, title="Chrome Memory (MB)")
+            st.plotly_chart(fig, use_container_width=True)
+        with col2:
+            fig = px.bar(resources_df, x='timestamp', y='cpu_seconds', color='outcome',
+                        hover_data=['peak_procs', 'duration_s'], title="Chrome CPU Seconds")
+            st.plotly_chart(fig, use_container_width=True)
+
+def logs_panel():
+    """Recent log lines; a fragment refreshed on the auto-refresh timer"""
+    # Log level filter
+    log_levels = ['ALL', 'INFO', 'WARNING', 'ERROR']
+    selected_level = st.selectbox("Filter by level:", log_levels)
+    
+    # Number of logs to show
+    max_logs = st.slider("Max logs to display:", 10, 1000, 100)
+    
+    # Read and display logs
+    logs_df = read_log_file(max_lines=max_logs)
+    
+    if not logs_df.empty:
+        if selected_level != 'ALL':
+            logs_df = logs_df[logs_df['level'] == selected_level]
+        
+        # Sort by timestamp descending
+        logs_df = logs_df.sort_values('timestamp', ascending=False)
+        
+        # Display logs with color coding
+        for _, log in logs_df.iterrows():
+            level_color = {
+                'INFO': '🟢',
+                'WARNING': '🟡',
+                'ERROR': '🔴'
+            }.get(log['level'], '⚪')
+            
+            timestamp_str = log['timestamp'].strftime('%Y-%m-%d %H:%M:%S') if pd.notna(log['timestamp']) else '—'
+            st.markdown(f"{level_color} **{timestamp_str}** [{log['level']}] {log['message']}")
+    else:
+        st.info("No logs found. The bot may not have run yet.")
+
+# Main dashboard
+def main():
+    # Imported here so a cold start only pays for plotly once a page is drawn
+    import plotly.express as px
+
+    st.title("🤖 LinkedIn Bot Dashboard")
+    st.markdown("Monitor and control your LinkedIn automation bot")
+    
+    # Sidebar controls
+    st.sidebar.header("🎛️ Bot Controls")
+    
+    # Status display; drawn below once the auto-refresh setting is known
+    status_box = st.sidebar.container()
     
     # Interval setting
     interval_minutes = st.sidebar.slider("Interval (minutes):", 1, 60, 5)
@@ -133,156 +512,92 @@ def main():
     
     with col1:
         if st.button("▶️ Start Scheduled", key="start_scheduled"):
-            if bot_manager.start_scheduled_bot(interval_minutes):
-                st.success("Scheduled bot started!")
+            if bot_worker.start_scheduled_bot(interval_minutes):
+                st.success("Scheduled bot starting...")
                 st.rerun()
             else:
                 st.error("Failed to start bot or already running")
     
     with col2:
         if st.button("⏹️ Stop Scheduled", key="stop_scheduled"):
-            if bot_manager.stop_scheduled_bot():
-                st.success("Scheduled bot stopped!")
+            if bot_worker.stop_scheduled_bot():
+                st.success("Scheduled bot stopping...")
                 st.rerun()
             else:
                 st.error("Failed to stop bot or not running")
     
     if st.sidebar.button("🔄 Run Once", key="run_once"):
-        with st.spinner("Running bot..."):
-            if bot_manager.run_once():
-                st.success("Bot run completed!")
-                st.rerun()
-            else:
-                st.error("Bot run failed!")
-    
-    # Auto-refresh toggle
-    auto_refresh = st.sidebar.checkbox("🔄 Auto-refresh (30s)", value=True)
+        if bot_worker.run_once():
+            st.success("Bot run started in the worker!")
+            st.rerun()
+        else:
+            st.error("Could not start a run (worker down or a run is in progress)")
     
-    if auto_refresh:
-        time.sleep(30)
-        st.rerun()
+    # Auto-refresh toggle: the live panels below are fragments that rerun on
+    # their own timer, so the script thread never sleeps and the rest of the
+    # page is not rebuilt
+    auto_refresh = st.sidebar.checkbox(f"🔄 Auto-refresh ({REFRESH_SECONDS}s)", value=True)
+    run_every = REFRESH_SECONDS if auto_refresh else None
     
     # Manual refresh button
     if st.sidebar.button("🔄 Refresh Now"):
         st.rerun()
     
+    with status_box:
+        st.fragment(run_every=run_every)(sidebar_status)()
+    
     # Main content tabs
     tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "📝 Logs", "📄 Posts", "⚙️ Settings"])
     
     with tab1:
         st.header("📊 Overview")
-        
-        # Metrics row
-        col1, col2, col3, col4 = st.columns(4)
-        
-        # Read recent logs for metrics
-        logs_df = read_log_file(max_lines=100)
-        posts_df = get_posts_from_sheets()
-        
-        with col1:
-            st.metric("Bot Status", "Running" if bot_status['is_running'] else "Stopped")
-        
-        with col2:
-            recent_logs = len(logs_df[logs_df['timestamp'] > datetime.now() - timedelta(hours=24)]) if not logs_df.empty else 0
-            st.metric("Log Entries (24h)", recent_logs)
-        
-        with col3:
-            if not posts_df.empty:
-                connected_today = len(posts_df[
-                    (posts_df['decision'] == 'Connected') & 
-                    (posts_df['timestamp'] > datetime.now() - timedelta(days=1))
-                ]) if 'timestamp' in posts_df.columns else 0
-            else:
-                connected_today = 0
-            st.metric("Connections Today", connected_today)
-        
-        with col4:
-            if not posts_df.empty:
-                total_posts = len(posts_df)
-            else:
-                total_posts = 0
-            st.metric("Total Posts Processed", total_posts)
-        
-        # Bot performance metrics
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Bot Runs", bot_status['run_count'])
-        with col2:
-            st.metric("Bot Errors", bot_status['error_count'])
-        with col3:
-            success_rate = ((bot_status['run_count'] - bot_status['error_count']) / bot_status['run_count'] * 100) if bot_status['run_count'] > 0 else 0
-            st.metric("Success Rate", f"{success_rate:.1f}%")
-        
-        # Recent activity chart
-        if not logs_df.empty:
-            st.subheader("📈 Recent Activity")
-            
-            # Group logs by hour
-            logs_df['hour'] = logs_df['timestamp'].dt.floor('H')
-            hourly_logs = logs_df.groupby(['hour', 'level']).size().reset_index(name='count')
-            
-            fig = px.bar(hourly_logs, x='hour', y='count', color='level',
-                        title="Log Activity by Hour",
-                        color_discrete_map={
-                            'INFO': '#2E8B57',
-                            'WARNING': '#FF8C00',
-                            'ERROR': '#DC143C'
-                        })
-            st.plotly_chart(fig, use_container_width=True)
+        st.fragment(run_every=run_every)(overview_panel)()
     
     with tab2:
         st.header("📝 Recent Logs")
-        
-        # Log level filter
-        log_levels = ['ALL', 'INFO', 'WARNING', 'ERROR']
-        selected_level = st.selectbox("Filter by level:", log_levels)
-        
-        # Number of logs to show
-        max_logs = st.slider("Max logs to display:", 10, 1000, 100)
-        
-        # Read and display logs
-        logs_df = read_log_file(max_lines=max_logs)
-        
-        if not logs_df.empty:
-            if selected_level != 'ALL':
-                logs_df = logs_df[logs_df['level'] == selected_level]
-            
-            # Sort by timestamp descending
-            logs_df = logs_df.sort_values('timestamp', ascending=False)
-            
-            # Display logs with color coding
-            for _, log in logs_df.iterrows():
-                level_color = {
-                    'INFO': '🟢',
-                    'WARNING': '🟡',
-                    'ERROR': '🔴'
-                }.get(log['level'], '⚪')
-                
-                timestamp_str = log['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                st.markdown(f"{level_color} **{timestamp_str}** [{log['level']}] {log['message']}")
-        else:
-            st.info("No logs found. The bot may not have run yet.")
+        st.fragment(run_every=run_every)(logs_panel)()
     
     with tab3:
         st.header("📄 Posts Analysis")
         
-        posts_df = get_posts_from_sheets()
+        windows = {'Last 24h': timedelta(days=1), 'Last 7 days': timedelta(days=7),
+                   'Last 30 days': timedelta(days=30), 'All': None}
+        window = st.selectbox("Time window:", list(windows), index=1)
+        since = datetime.now() - windows[window] if windows[window] else None
+        posts_df = get_posts(since)
         
         if not posts_df.empty:
             # Decision distribution
             col1, col2 = st.columns(2)
             
+            # Charts come from the daily rollup when the local store exists
+            daily_rollup = get_decision_rollup('day', since) if get_decision_store() is not None else None
+            if daily_rollup is not None and daily_rollup.empty:
+                daily_rollup = None
+            
             with col1:
-                if 'decision' in posts_df.columns:
+                if daily_rollup is not None:
+                    decision_counts = daily_rollup.groupby('decision')['count'].sum()
+                elif 'decision' in posts_df.columns:
                     decision_counts = posts_df['decision'].value_counts()
+                else:
+                    decision_counts = None
+                if decision_counts is not None:
                     fig = px.pie(values=decision_counts.values, names=decision_counts.index,
                                title="Decision Distribution")
                     st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                if 'timestamp' in posts_df.columns:
-                    posts_df['date'] = pd.to_datetime(posts_df['timestamp']).dt.date
-                    daily_posts = posts_df.groupby('date').size().reset_index(name='count')
+                if daily_rollup is not None:
+                    dates = daily_rollup['timestamp'].dt.date.rename('date')
+                    daily_posts = daily_rollup.groupby(dates)['count'].sum().reset_index(name='count')
+                elif 'timestamp' in posts_df.columns:
+                    # Group without adding columns: posts_df may be the shared cached frame
+                    dates = pd.to_datetime(posts_df['timestamp']).dt.date.rename('date')
+                    daily_posts = posts_df.groupby(dates).size().reset_index(name='count')
+                else:
+                    daily_posts = None
+                if daily_posts is not None:
                     fig = px.line(daily_posts, x='date', y='count',
                                 title="Posts Processed Daily")
                     st.plotly_chart(fig, use_container_width=True)
@@ -294,7 +609,7 @@ def main():
             decision_filter = st.selectbox("Filter by decision:", 
                                          ['All'] + list(posts_df['decision'].unique()) if 'decision' in posts_df.columns else ['All'])
             
-            display_df = posts_df.copy()
+            display_df = posts_df
             if decision_filter != 'All':
                 display_df = display_df[display_df['decision'] == decision_filter]
             
@@ -302,11 +617,16 @@ def main():
             if 'timestamp' in display_df.columns:
                 display_df = display_df.sort_values('timestamp', ascending=False)
             
-            # Display top 50 posts
-            st.dataframe(display_df.head(50), use_container_width=True)
+            # Display one page of 50 posts
+            page_size = 50
+            pages = max(1, (len(display_df) + page_size - 1) // page_size)
+            page = st.number_input("Page:", min_value=1, max_value=pages, value=1, step=1)
+            start = (page - 1) * page_size
+            st.caption(f"Showing {start + 1}-{min(start + page_size, len(display_df))} of {len(display_df)} posts")
+            st.dataframe(display_df.iloc[start:start + page_size], use_container_width=True)
             
         else:
-            st.info("No posts data found. Make sure Google Sheets integration is configured or run the bot first.")
+            st.info("No posts data found. Run the bot first or configure the Google Sheets export.")
     
     with tab4:
         st.header("⚙️ Settings")
@@ -314,16 +634,20 @@ def main():
         # Bot configuration
         st.subheader("🤖 Bot Configuration")
         
-        # Display current prompt
-        current_prompt = "I want to connect to people who are hiring for Software Engineer roles with experience of more than 1 year"
-        st.text_area("Current Search Prompt:", value=current_prompt, disabled=True, height=100)
+        # Targeting prompts the bot scores posts against
+        for prompt_id, prompt in PROMPTS.items():
+            thresholds = ", ".join(f"{scorer} {by_prompt.get(prompt_id, 'default')}"
+                                   for scorer, by_prompt in THRESHOLDS.items())
+            st.text_area(f"Prompt `{prompt_id}` (thresholds: {thresholds}):",
+                         value=prompt, disabled=True, height=100, key=f"prompt_{prompt_id}")
         
         # File status
         st.subheader("📁 File Status")
         
         files_to_check = [
-            ("Log File", "bot_logs.log"),
-            ("Cookies", "config/cookies.pkl"),
+            ("Log File", default_log_file()),
+            ("Decision Store", DECISIONS_DB_PATH),
+            ("Cookies", COOKIES_PATH),
             ("Credentials", "config/credentials.json")
         ]
         
@@ -333,6 +657,38 @@ def main():
             size = os.path.getsize(path) if exists else 0
             st.markdown(f"**{name}:** {status} ({size} bytes)")
         
+        # Per-session trace files (bot.tracing)
+        st.subheader("🧵 Recent Session Traces")
+        traces = recent_traces(limit=5)
+        if traces:
+            st.caption("Open a downloaded trace in https://ui.perfetto.dev or chrome://tracing")
+            st.dataframe(pd.DataFrame([{
+                "File": os.path.basename(path),
+                "Size (KB)": round(size / 1024),
+                "Written": datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            } for path, size, mtime in traces]), use_container_width=True, hide_index=True)
+
+            # Traces can be tens of MB: only the picked one is read, and only on request
+            paths = [path for path, _, _ in traces]
+            path = st.selectbox("Trace:", paths, format_func=os.path.basename, key="trace_path")
+            prepared = st.session_state.get("trace_download")
+            if st.button("📦 Prepare download", key="trace_prepare"):
+                try:
+                    with open(path, "rb") as f:
+                        prepared = (path, f.read())
+                except FileNotFoundError:
+                    prepared = None
+                    st.warning("That trace was rotated out; pick a newer one.")
+                st.session_state["trace_download"] = prepared
+            if prepared and prepared[0] == path:
+                st.download_button(f"⬇️ Download {os.path.basename(path)}", prepared[1],
+                                   file_name=os.path.basename(path), mime="application/json",
+                                   key="trace_download_button")
+        elif TRACE_ENABLED:
+            st.info("No traces yet; one is written after each bot session.")
+        else:
+            st.info("Tracing is off. Start the bot with BOT_TRACE=1 to write a trace per session.")
+        
         # System info
         st.subheader("💻 System Information")
         st.markdown(f"**Python:** {sys.version}")
@@ -341,7 +697,7 @@ def main():
         
         # Bot manager status
         st.subheader("🔧 Bot Manager Status")
-        st.json(bot_status)
+        st.json(bot_worker.get_status())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
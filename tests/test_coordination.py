@@ -0,0 +1,32 @@
+import pytest
+
+from bot import coordination
+from bot_manager import BotManager
+
+
+@pytest.fixture(autouse=True)
+def jobstore_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(coordination, "JOBSTORE_DIR", str(tmp_path))
+
+
+def test_schedule_kept_on_shutdown_is_resumed():
+    manager = BotManager()
+    assert manager.start_scheduled_bot(60)
+    next_run = manager.get_next_run_time()
+    assert manager.stop_scheduled_bot(clear_schedule=False)
+
+    restarted = BotManager()
+    assert restarted.resume_scheduled_bot(60)
+    assert restarted.is_running
+    assert restarted.get_next_run_time() == next_run
+    restarted.stop_scheduled_bot()
+
+
+def test_stopped_schedule_is_not_resumed():
+    manager = BotManager()
+    assert manager.start_scheduled_bot(60)
+    assert manager.stop_scheduled_bot()
+
+    restarted = BotManager()
+    assert not restarted.resume_scheduled_bot(60)
+    assert not restarted.is_running
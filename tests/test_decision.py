@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from benchmarks.labelled_store import load_labelled_posts
+from bot.decision import SCORER_THRESHOLDS, DecisionEngine
+from bot.prompts import PROMPTS, THRESHOLDS
+
+
+@pytest.mark.parametrize("scorer", sorted(SCORER_THRESHOLDS))
+def test_default_thresholds_select_the_labelled_positives(scorer, tmp_path, monkeypatch):
+    # Fit from scratch: no saved model, reference corpus or decision store
+    monkeypatch.chdir(tmp_path)
+    labelled = load_labelled_posts()
+    labels = np.array([select for _, select in labelled])
+
+    engine = DecisionEngine(PROMPTS, THRESHOLDS, scorer=scorer)
+    selected = engine.score_batch([text for text, _ in labelled]).mask
+
+    assert (selected & labels).sum() >= 0.8 * labels.sum()
+    assert (selected == labels).mean() >= 0.8
+
+
+def test_thresholds_are_picked_by_scorer(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    thresholds = {"tfidf": {"a": 0.2}, "bm25": 0.07}
+    prompts = {"a": "hiring engineers", "b": "remote jobs"}
+
+    assert list(DecisionEngine(prompts, thresholds).thresholds) == [0.2, SCORER_THRESHOLDS["tfidf"]]
+    assert list(DecisionEngine(prompts, thresholds, scorer="bm25").thresholds) == [0.07, 0.07]
+    assert list(DecisionEngine(prompts, scorer="bm25").thresholds) == [SCORER_THRESHOLDS["bm25"]] * 2
@@ -0,0 +1,36 @@
+import json
+
+from streamlit_app import parse_json_log_lines
+
+
+def record(ts, msg, level="INFO", **extra):
+    return json.dumps({"ts": ts, "level": level, "event": None, "session": "s1", "post": None,
+                       "msg": msg, **extra}, ensure_ascii=False)
+
+
+def test_json_lines_are_parsed():
+    lines = [record(1.7e9, "📌 Processing post 1", post=1), record(1.7e9 + 1, "done", "WARNING")]
+    df = parse_json_log_lines(lines)
+    assert list(df["level"]) == ["INFO", "WARNING"]
+    assert list(df["message"]) == ["📌 Processing post 1", "done"]
+    assert (df["timestamp"].diff().iloc[1].total_seconds()) == 1
+    assert list(df["raw"]) == lines
+
+
+def test_bad_lines_are_kept_as_unknown():
+    good = [record(1.7e9 + i, f"post {i}") for i in range(4)]
+    truncated = good[1][:25]
+    interleaved = good[2] + good[3]
+    lines = [good[0], truncated, interleaved, good[3]]
+    df = parse_json_log_lines(lines)
+
+    assert list(df["level"]) == ["INFO", "UNKNOWN", "UNKNOWN", "INFO"]
+    assert list(df["message"]) == ["post 0", truncated, interleaved, "post 3"]
+    # Bad lines take the time of the record above them
+    assert df["timestamp"].iloc[1] == df["timestamp"].iloc[0]
+    assert df["timestamp"].notna().all()
+
+
+def test_only_bad_lines():
+    df = parse_json_log_lines(['{"ts": 1', "not json"])
+    assert list(df["level"]) == ["UNKNOWN", "UNKNOWN"]
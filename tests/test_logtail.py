@@ -0,0 +1,19 @@
+from bot.logtail import LogTailer, last_line_end
+
+
+def test_first_read_leaves_a_partial_line_for_later(tmp_path):
+    path = tmp_path / "bot_logs.log"
+    path.write_bytes(b"first\nsecond\nthi")
+    tailer = LogTailer(str(path))
+    assert tailer.read() == ["first", "second"]
+
+    with open(path, "ab") as f:
+        f.write(b"rd line\nfourth\n")
+    assert tailer.read() == ["first", "second", "third line", "fourth"]
+
+
+def test_last_line_end_across_blocks(tmp_path):
+    path = tmp_path / "bot_logs.log"
+    path.write_bytes(b"a\n" + b"x" * 100)
+    assert last_line_end(str(path), 102, block_size=8) == 2
+    assert last_line_end(str(path), 1, block_size=8) == 0
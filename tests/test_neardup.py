@@ -0,0 +1,73 @@
+from bot.neardup import NearDupIndex, minhash
+
+POST = "We are hiring senior software engineers to build our payments platform in Berlin"
+RESHARE = "We are hiring senior software engineers to build our payments platform in Berlin!"
+
+
+def test_reshare_matches_the_recorded_post(tmp_path):
+    index = NearDupIndex(str(tmp_path / "near_dups.db"))
+    index.add("post-1", minhash(POST), "Connected")
+    assert index.find(minhash(RESHARE), "post-2") == ("post-1", "Connected")
+    index.close()
+
+
+def test_post_does_not_match_itself(tmp_path):
+    index = NearDupIndex(str(tmp_path / "near_dups.db"))
+    index.add("post-1", minhash(POST))
+    assert index.find(minhash(POST), "post-1") is None
+    assert index.find(minhash(RESHARE), "post-2") == ("post-1", None)
+    index.close()
+
+
+def test_post_without_decision_is_not_persisted(tmp_path):
+    path = str(tmp_path / "near_dups.db")
+    index = NearDupIndex(path)
+    index.add("post-1", minhash(POST))
+    index.close()
+
+    # The session failed before recording a decision: the next one processes it again
+    index = NearDupIndex(path)
+    assert index.find(minhash(POST), "post-1") is None
+    assert index.stats()["indexed"] == 0
+    index.add("post-1", minhash(POST), "Skipped")
+    index.close()
+
+    index = NearDupIndex(path)
+    assert index.find(minhash(RESHARE), "post-2") == ("post-1", "Skipped")
+    index.close()
+
+
+def test_long_lived_index_forgets_pending_posts(tmp_path):
+    index = NearDupIndex(str(tmp_path / "near_dups.db"))
+    index.add("post-1", minhash(POST))
+    assert index.forget_pending() == 1
+
+    # A reshare seen in a later session is not hidden behind a post that never got a decision
+    index.refresh()
+    assert index.find(minhash(RESHARE), "post-2") is None
+    assert index.stats()["checked"] == 1
+    index.close()
+
+
+def test_refresh_loads_signatures_stored_by_another_process(tmp_path):
+    path = str(tmp_path / "near_dups.db")
+    index = NearDupIndex(path)
+    other = NearDupIndex(path)
+    other.add("post-1", minhash(POST), "Connected")
+    other.close()
+
+    assert index.find(minhash(RESHARE), "post-2") is None
+    index.refresh()
+    assert index.stats()["checked"] == 0
+    assert index.find(minhash(RESHARE), "post-2") == ("post-1", "Connected")
+    index.close()
+
+
+def test_expired_signatures_leave_the_memory_index(tmp_path):
+    index = NearDupIndex(str(tmp_path / "near_dups.db"))
+    index.add("post-1", minhash(POST), "Skipped")
+    index.ttl_seconds = -1
+    index.refresh()
+    assert index.find(minhash(RESHARE), "post-2") is None
+    assert index.stats()["indexed"] == 0
+    index.close()
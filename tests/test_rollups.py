@@ -0,0 +1,36 @@
+import logging
+import time
+
+from bot.rollups import LogRollup, LogRollupHandler
+
+
+def test_handler_flushes_without_further_records(tmp_path):
+    path = str(tmp_path / "rollups.db")
+    handler = LogRollupHandler(path, flush_seconds=0.05)
+    logger = logging.getLogger("test_rollups.timer")
+    logger.addHandler(handler)
+    try:
+        logger.warning("one")
+        logger.error("two")
+        rollup = LogRollup(path)
+        deadline = time.monotonic() + 5
+        while rollup.total() < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert rollup.total() == 2
+        assert rollup.total(level="ERROR") == 1
+        rollup.close()
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_close_flushes_pending_counts(tmp_path):
+    path = str(tmp_path / "rollups.db")
+    handler = LogRollupHandler(path, flush_seconds=60)
+    handler.handle(logging.makeLogRecord({"levelname": "INFO", "msg": "pending"}))
+    handler.close()
+    assert not handler._thread.is_alive()
+
+    rollup = LogRollup(path)
+    assert rollup.total() == 1
+    rollup.close()
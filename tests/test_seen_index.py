@@ -0,0 +1,25 @@
+from bot.seen_index import SeenIndex
+
+
+def test_lru_carries_over_between_sessions(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.db"))
+    index.add("urn:li:activity:1", "Skipped")
+
+    index.start_session()
+    assert index.stats()["hits"] == 0
+    assert index.stats()["cached"] == 1
+    # Answered from the LRU: the row is gone from SQLite but the key is still cached
+    index.conn.execute("DELETE FROM seen")
+    assert index.seen("urn:li:activity:1")
+    assert index.stats()["hits"] == 1
+    index.close()
+
+
+def test_start_session_evicts_expired_posts(tmp_path):
+    index = SeenIndex(str(tmp_path / "seen.db"))
+    index.add("urn:li:activity:1", "Skipped")
+    index.ttl_seconds = -1
+    index.start_session()
+    assert index.stats()["cached"] == 0
+    assert not index.seen("urn:li:activity:1")
+    index.close()
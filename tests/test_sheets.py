@@ -0,0 +1,205 @@
+import json
+import time
+
+from bot.sheets import SheetReader, SheetWriter
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class StubAPIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = StubResponse(status_code)
+
+
+class StubWorksheet:
+    """Records appended batches; fails with the queued status codes first"""
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.batches = []
+        self.calls = 0
+
+    def append_rows(self, rows, value_input_option=None):
+        self.calls += 1
+        if self.failures:
+            raise StubAPIError(self.failures.pop(0))
+        self.batches.append([list(row) for row in rows])
+
+
+class StubClient:
+    def __init__(self, worksheet):
+        self.sheet1 = worksheet
+
+    def open(self, name):
+        return self
+
+
+def make_writer(worksheet, tmp_path, **kwargs):
+    options = {"batch_size": 3, "flush_interval": 60.0, "backoff_base": 0.001,
+               "spill_path": str(tmp_path / "spill.jsonl")}
+    options.update(kwargs)
+    return SheetWriter(lambda: StubClient(worksheet), **options)
+
+
+def rows(n):
+    return [[f"2024-01-01 00:00:{i:02d}", f"name {i}", f"content {i}", "Skipped"] for i in range(n)]
+
+
+def test_rows_are_appended_in_batches(tmp_path):
+    worksheet = StubWorksheet()
+    writer = make_writer(worksheet, tmp_path)
+    for row in rows(7):
+        writer.enqueue(row)
+    writer.start()
+    writer.stop()
+
+    assert [len(batch) for batch in worksheet.batches] == [3, 3, 1]
+    assert [row for batch in worksheet.batches for row in batch] == rows(7)
+    assert writer.rows_sent == 7
+    assert not (tmp_path / "spill.jsonl").exists()
+
+
+def test_partial_batch_is_sent_after_flush_interval(tmp_path):
+    worksheet = StubWorksheet()
+    writer = make_writer(worksheet, tmp_path, flush_interval=0.05)
+    writer.start()
+    writer.enqueue(rows(1)[0])
+    deadline = 50
+    while not worksheet.batches and deadline:
+        writer._stop.wait(0.05)
+        deadline -= 1
+    assert worksheet.batches == [rows(1)]
+    writer.stop()
+
+
+def test_rate_limited_append_is_retried(tmp_path):
+    worksheet = StubWorksheet(failures=[429, 503])
+    writer = make_writer(worksheet, tmp_path)
+    for row in rows(3):
+        writer.enqueue(row)
+    writer.start()
+    writer.stop()
+
+    assert worksheet.calls == 3
+    assert worksheet.batches == [rows(3)]
+    assert writer.rows_spilled == 0
+
+
+def test_unsent_rows_are_spilled_and_reloaded(tmp_path):
+    failing = StubWorksheet(failures=[400])
+    writer = make_writer(failing, tmp_path)
+    for row in rows(2):
+        writer.enqueue(row)
+    writer.start()
+    writer.stop()
+
+    spill = tmp_path / "spill.jsonl"
+    assert failing.calls == 1
+    assert writer.rows_spilled == 2
+    assert [json.loads(line) for line in spill.read_text().splitlines()] == rows(2)
+
+    # The next writer (e.g. after a restart) sends the spilled rows first
+    worksheet = StubWorksheet()
+    writer = make_writer(worksheet, tmp_path)
+    writer.start()
+    writer.stop()
+    assert worksheet.batches == [rows(2)]
+    assert not spill.exists()
+
+
+def test_rows_left_after_retries_are_spilled(tmp_path):
+    worksheet = StubWorksheet(failures=[429] * 3)
+    writer = make_writer(worksheet, tmp_path, max_retries=2)
+    for row in rows(3):
+        writer.enqueue(row)
+    writer.start()
+    writer.stop()
+
+    assert worksheet.calls == 3
+    assert writer.rows_spilled == 3
+
+
+def test_stop_spills_rows_instead_of_outlasting_its_timeout(tmp_path):
+    worksheet = StubWorksheet(failures=[429] * 10)
+    writer = make_writer(worksheet, tmp_path, backoff_base=10.0)
+    for row in rows(3):
+        writer.enqueue(row)
+    writer.start()
+    started = time.monotonic()
+    writer.stop(timeout=2.0)
+
+    assert time.monotonic() - started < 2.0
+    assert worksheet.calls == 1
+    assert writer.rows_spilled == 3
+    spill = tmp_path / "spill.jsonl"
+    assert [json.loads(line) for line in spill.read_text().splitlines()] == rows(3)
+
+
+def test_stop_without_start_spills_queued_rows(tmp_path):
+    writer = make_writer(StubWorksheet(), tmp_path)
+    for row in rows(2):
+        writer.enqueue(row)
+    writer.stop()
+    assert writer.rows_spilled == 2
+
+
+class StubReadWorksheet:
+    def __init__(self, values):
+        self.values = values
+        self.full_reads = 0
+        self.ranges = []
+
+    def get_all_values(self):
+        self.full_reads += 1
+        return [list(row) for row in self.values]
+
+    def get_values(self, a1_range):
+        self.ranges.append(a1_range)
+        first_row = int("".join(ch for ch in a1_range.split(":")[0] if ch.isdigit()))
+        return [list(row) for row in self.values[first_row - 1:]]
+
+
+def test_reader_fetches_only_new_rows():
+    worksheet = StubReadWorksheet([["Timestamp", "Name", "Content", "Decision"],
+                                   ["t1", "a", "c1", "Skipped"]])
+    reader = SheetReader(lambda: StubClient(worksheet), ttl=0)
+    assert reader.fetch() == (worksheet.values[0], [worksheet.values[1]])
+
+    worksheet.values.append(["t2", "b", "c2"])
+    header, got = reader.fetch()
+    assert worksheet.full_reads == 1
+    assert worksheet.ranges == ["A3:D"]
+    assert got == [["t1", "a", "c1", "Skipped"], ["t2", "b", "c2", ""]]
+
+
+def test_reader_retries_full_read_while_sheet_is_empty():
+    worksheet = StubReadWorksheet([])
+    reader = SheetReader(lambda: StubClient(worksheet), ttl=0)
+    assert reader.fetch() == ([], [])
+
+    worksheet.values.extend([["Timestamp", "Name", "Content", "Decision"],
+                             ["t1", "a", "c1", "Connected"]])
+    header, got = reader.fetch()
+    assert worksheet.full_reads == 2
+    assert header == ["Timestamp", "Name", "Content", "Decision"]
+    assert got == [["t1", "a", "c1", "Connected"]]
+
+
+def test_reader_skips_blank_rows_without_losing_its_place():
+    worksheet = StubReadWorksheet([["Timestamp", "Name", "Content", "Decision"],
+                                   ["t1", "a", "c1", "Skipped"],
+                                   [],
+                                   ["t2", "b", "c2", "Connected"]])
+    reader = SheetReader(lambda: StubClient(worksheet), ttl=0)
+    assert reader.fetch()[1] == [worksheet.values[1], worksheet.values[3]]
+
+    worksheet.values.extend([[], ["t3", "c", "c3", "Skipped"]])
+    assert reader.fetch()[1][-1] == ["t3", "c", "c3", "Skipped"]
+    worksheet.values.append(["t4", "d", "c4", "Skipped"])
+    header, got = reader.fetch()
+    assert worksheet.ranges == ["A5:D", "A7:D"]
+    assert [row[0] for row in got] == ["t1", "t2", "t3", "t4"]